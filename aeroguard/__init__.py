@@ -0,0 +1,6 @@
+"""
+AeroGuard Core Package
+----------------------
+UI-free building blocks shared by the Streamlit app (flight_sim.py)
+and the offline tooling. Nothing in here imports Streamlit.
+"""
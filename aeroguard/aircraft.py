@@ -0,0 +1,147 @@
+"""
+AeroGuard Aircraft Database
+---------------------------
+Reference profiles for the supported aircraft types, loaded from
+`aeroguard/data/aircraft.csv` (or the file named by AEROGUARD_AIRCRAFT).
+
+Envelope keys used by the physics core: mass (kg), area (m^2),
+ceiling (m), fuel_rate (kg/s), speed_limit (Vne, m/s) and
+low_alt_limit (max safe speed below 1000 m, m/s).
+
+The table is one NumPy structured array (one row per type) plus a
+name -> row index, so thousands of types stay compact and the physics
+can run across all of them at once via `AircraftTable.check_all()`.
+Profiles handed out by the table are read-only views; per-session
+changes (e.g. the custom aircraft) are overlays made with
+`AircraftProfile.with_overrides()`, never writes to the shared table.
+"""
+
+import csv
+import os
+from collections.abc import Mapping
+
+import numpy as np
+
+from aeroguard import physics
+
+DEFAULT_PATH = os.environ.get(
+    "AEROGUARD_AIRCRAFT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "aircraft.csv"))
+ENVELOPE_FIELDS = ("mass", "area", "ceiling", "fuel_rate", "speed_limit", "low_alt_limit")
+DESC_PREFIX = "desc_"
+CUSTOM = "Custom / Manuel"
+
+
+class AircraftProfile(Mapping):
+    """Read-only view of one table row, with optional per-session overrides on top."""
+
+    __slots__ = ("table", "row", "overrides")
+
+    def __init__(self, table, row, overrides=None):
+        self.table = table
+        self.row = row
+        self.overrides = dict(overrides or {})
+
+    @property
+    def name(self):
+        return self.table.names[self.row]
+
+    def __getitem__(self, key):
+        if key in self.overrides:
+            return self.overrides[key]
+        if key == "desc":
+            return self.table.descriptions(self.row)
+        if key not in self.table.records.dtype.names:
+            raise KeyError(key)
+        return self.table.records[key][self.row].item()
+
+    def __iter__(self):
+        yield from (f for f in self.table.records.dtype.names if not f.startswith(DESC_PREFIX))
+        yield "desc"
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def with_overrides(self, **values):
+        """New profile with `values` layered over this one; the table is untouched."""
+        return AircraftProfile(self.table, self.row, {**self.overrides, **values})
+
+    def __repr__(self):
+        return f"AircraftProfile({self.name!r}, overrides={self.overrides!r})"
+
+
+class AircraftTable(Mapping):
+    """Aircraft types as a structured array with a name index; maps name -> AircraftProfile."""
+
+    def __init__(self, records):
+        self.records = records
+        self.records.flags.writeable = False
+        self.names = [str(n) for n in records["name"]]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.languages = [f[len(DESC_PREFIX):] for f in records.dtype.names if f.startswith(DESC_PREFIX)]
+
+    def __getitem__(self, name):
+        return AircraftProfile(self, self.index[name])
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def profile(self, name, **overrides):
+        """Profile for `name` with optional overrides (e.g. sweep rows, custom inputs)."""
+        return AircraftProfile(self, self.index[name], overrides)
+
+    def descriptions(self, row):
+        return {lang: str(self.records[DESC_PREFIX + lang][row]) for lang in self.languages}
+
+    def envelope(self, names=None, grid=False):
+        """
+        Envelope columns as float arrays, one entry per type (all types, or
+        `names` in order). With `grid=True` the columns are (types, 1), so
+        they broadcast against 1-D sample arrays in `physics.crash_codes` /
+        `check_envelope` to a (types, samples) result.
+        """
+        rows = slice(None) if names is None else [self.index[n] for n in names]
+        return {f: self.records[f][rows][:, None] if grid else self.records[f][rows] for f in ENVELOPE_FIELDS}
+
+    def check_all(self, alt, vel, names=None):
+        """
+        Envelope check of the same (altitude, velocity) samples for every
+        type in one pass. Returns (stall_speeds, crash_codes), shaped
+        (types, samples).
+        """
+        alt = np.ravel(np.asarray(alt, dtype=float))
+        vel = np.ravel(np.asarray(vel, dtype=float))
+        return physics.check_envelope(alt, vel, self.envelope(names, grid=True))
+
+
+def load_aircraft(path=DEFAULT_PATH):
+    """Reads an aircraft CSV (one row per type) into an AircraftTable."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != len(header):
+                raise ValueError(f"{path}, line {reader.line_num}: expected {len(header)} fields, got {len(row)}")
+            rows.append(row)
+    if not rows:
+        raise ValueError(f"No aircraft in {path}")
+    columns = list(zip(*rows))
+
+    missing = {"name", *ENVELOPE_FIELDS} - set(header)
+    if missing:
+        raise ValueError(f"Aircraft file {path} lacks columns: {', '.join(sorted(missing))}")
+
+    arrays = [np.asarray(col, dtype=float if h in ENVELOPE_FIELDS else str) for h, col in zip(header, columns)]
+    records = np.empty(len(columns[0]), dtype=[(h, a.dtype) for h, a in zip(header, arrays)])
+    for h, a in zip(header, arrays):
+        records[h] = a
+    return AircraftTable(records)
+
+
+# --- AIRCRAFT DATABASE ---
+AIRCRAFT_DB = load_aircraft()
@@ -0,0 +1,230 @@
+"""
+AeroGuard Analysis Charts
+-------------------------
+Cached rendering for the flight envelope, takeoff performance and
+safety map charts.
+
+The expensive part of each chart (axes, grid, labels, envelope curve)
+only depends on the aircraft and the UI language, so it is rendered
+once with the Agg backend and cached as a raw RGBA pixel buffer. Each
+interaction copies that buffer and draws the cheap, changing part (the
+operating point, or the takeoff speed line) on top with Pillow.
+
+Figures are created with `matplotlib.figure.Figure` rather than pyplot,
+so they are never registered globally and are released as soon as the
+background has been captured. Matplotlib and Pillow are imported on
+first render, so importing this module (e.g. for `envelope_curve`)
+does not load them.
+
+Each chart call counts a background cache hit or miss as `charts.hits` /
+`charts.misses` for the caller's active diagnostics.
+"""
+
+import contextvars
+import io
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from aeroguard import diagnostics, physics, safety_map
+
+# --- STYLE ---
+FIG_SIZE = (6, 3)
+DPI = 100
+FIG_COLOR = '#1b1e24'
+AXES_COLOR = '#0e1117'
+ENVELOPE_COLOR = '#00ffcc'
+TAKEOFF_COLOR = '#ff00ff'
+SAFE_COLOR = '#00ff00'
+STALL_COLOR = '#ff0000'
+# Safety map colour per crash code: OK, ALT_HIGH, STALL, STRUCT, ALT_LOW_SPEED
+RULE_COLORS = ('#1f6f50', '#7b4bd6', '#d62f2f', '#f08a24', '#e6d02a')
+
+# --- RANGES ---
+ENVELOPE_ALT_MAX = 16000.0
+ENVELOPE_POINTS = 100
+ENVELOPE_SPEED_MAX = 1000.0
+WIND_RANGE = (-30.0, 30.0)
+TAKEOFF_FACTOR = 1.1
+MARKER_RADIUS = 7
+
+_rendered = contextvars.ContextVar("aeroguard_chart_rendered", default=False)
+
+
+@dataclass(frozen=True)
+class ChartBackground:
+    """Rendered static chart plus the data -> pixel mapping of its axes."""
+    rgba: np.ndarray  # (H, W, 4) uint8, read-only
+    xlim: tuple
+    ylim: tuple
+    px_box: tuple  # (left, top, right, bottom) pixel bounds of the axes
+
+    def to_pixel(self, x, y):
+        """Maps data coordinates to image pixels, clamped to the axes area."""
+        left, top, right, bottom = self.px_box
+        fx = (x - self.xlim[0]) / (self.xlim[1] - self.xlim[0])
+        fy = (y - self.ylim[0]) / (self.ylim[1] - self.ylim[0])
+        px = left + min(max(fx, 0.0), 1.0) * (right - left)
+        py = bottom - min(max(fy, 0.0), 1.0) * (bottom - top)
+        return px, py
+
+
+# --- CURVES ---
+@lru_cache(maxsize=256)
+def envelope_curve(mass, area, alt_max=ENVELOPE_ALT_MAX, n=ENVELOPE_POINTS):
+    """Stall speed over altitude for one mass/area, as read-only (alts, stalls) arrays."""
+    alts = np.linspace(0, alt_max, n)
+    stalls = physics.stall_speed(alts, mass, area)
+    alts.flags.writeable = False
+    stalls.flags.writeable = False
+    return alts, stalls
+
+
+# --- BACKGROUNDS ---
+def _new_axes():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=FIG_SIZE, dpi=DPI)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    fig.patch.set_facecolor(FIG_COLOR)
+    ax.set_facecolor(AXES_COLOR)
+    return fig, ax
+
+
+def _capture(fig, ax):
+    """Renders the figure once, captures pixels + axes mapping, then releases it."""
+    ax.set_autoscale_on(False)
+    fig.tight_layout()
+    fig.canvas.draw()
+    rgba = np.asarray(fig.canvas.buffer_rgba()).copy()
+    rgba.flags.writeable = False
+    height = rgba.shape[0]
+    (x0, y0), (x1, y1) = ax.transData.transform([(ax.get_xlim()[0], ax.get_ylim()[0]),
+                                                 (ax.get_xlim()[1], ax.get_ylim()[1])])
+    bg = ChartBackground(rgba=rgba, xlim=ax.get_xlim(), ylim=ax.get_ylim(),
+                         px_box=(x0, height - y1, x1, height - y0))
+    fig.clear()
+    _rendered.set(True)
+    return bg
+
+
+def _style(ax, xlabel, ylabel):
+    ax.set_xlabel(xlabel, color='white')
+    ax.set_ylabel(ylabel, color='white')
+    ax.tick_params(colors='white')
+    ax.grid(alpha=0.2)
+
+
+@lru_cache(maxsize=64)
+def envelope_background(mass, area, xlabel, ylabel):
+    """Flight envelope chart without the operating point."""
+    alts, stalls = envelope_curve(mass, area)
+    fig, ax = _new_axes()
+    ax.plot(alts, stalls, color=ENVELOPE_COLOR, linewidth=2)
+    ax.fill_between(alts, stalls, ENVELOPE_SPEED_MAX, color=ENVELOPE_COLOR, alpha=0.1)
+    ax.set_xlim(alts[0], alts[-1])
+    ax.set_ylim(0, max(ENVELOPE_SPEED_MAX, float(stalls.max())) * 1.05)
+    _style(ax, xlabel, ylabel)
+    return _capture(fig, ax)
+
+
+@lru_cache(maxsize=64)
+def takeoff_background(mass, area, xlabel, ylabel):
+    """Takeoff performance axes, scaled for every altitude of the envelope."""
+    _, stalls = envelope_curve(mass, area)
+    fig, ax = _new_axes()
+    ax.axvline(0, color='white', linestyle='--')
+    ax.set_xlim(*WIND_RANGE)
+    lo = float(stalls.min()) * TAKEOFF_FACTOR + WIND_RANGE[0]
+    hi = float(stalls.max()) * TAKEOFF_FACTOR + WIND_RANGE[1]
+    pad = 0.05 * (hi - lo)
+    ax.set_ylim(lo - pad, hi + pad)
+    _style(ax, xlabel, ylabel)
+    return _capture(fig, ax)
+
+
+@lru_cache(maxsize=64)
+def safety_background(envelope, xlabel, ylabel):
+    """Altitude x speed map coloured by crash rule, for one `safety_map.envelope_key`."""
+    from matplotlib.colors import ListedColormap
+    from matplotlib.patches import Patch
+
+    smap = safety_map.safety_map(dict(zip(safety_map.ENVELOPE_KEYS, envelope)))
+    fig, ax = _new_axes()
+    ax.imshow(smap.codes, origin='lower', aspect='auto', interpolation='nearest',
+              extent=(*smap.alt_range, *smap.speed_range), cmap=ListedColormap(RULE_COLORS),
+              vmin=-0.5, vmax=len(RULE_COLORS) - 0.5)
+    names = ("OK",) + physics.CRASH_NAMES[1:]
+    ax.legend(handles=[Patch(color=c, label=n) for c, n in zip(RULE_COLORS, names)],
+              loc='upper right', fontsize=6, framealpha=0.6)
+    _style(ax, xlabel, ylabel)
+    return _capture(fig, ax)
+
+
+def _background(cached, *args):
+    """`cached(*args)` for one of the cached backgrounds, counted as a hit or a miss."""
+    token = _rendered.set(False)
+    try:
+        bg = cached(*args)
+        diagnostics.count("charts.misses" if _rendered.get() else "charts.hits")
+    finally:
+        _rendered.reset(token)
+    return bg
+
+
+# --- OVERLAYS ---
+def _draw(bg):
+    """Writable Pillow copy of a background and a drawing context for it."""
+    from PIL import Image, ImageDraw
+
+    img = Image.fromarray(bg.rgba)
+    return img, ImageDraw.Draw(img)
+
+
+def _to_png(img):
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+def envelope_image(mass, area, alt, velocity, stall_v, xlabel, ylabel):
+    """PNG bytes of the envelope chart with the current operating point."""
+    bg = _background(envelope_background, mass, area, xlabel, ylabel)
+    img, draw = _draw(bg)
+    px, py = bg.to_pixel(alt, velocity)
+    r = MARKER_RADIUS
+    draw.ellipse((px - r, py - r, px + r, py + r),
+                 fill=SAFE_COLOR if velocity > stall_v else STALL_COLOR)
+    return _to_png(img)
+
+
+def safety_image(ac, alt, velocity, xlabel, ylabel):
+    """PNG bytes of the safety map with the current operating point."""
+    bg = _background(safety_background, safety_map.envelope_key(ac), xlabel, ylabel)
+    img, draw = _draw(bg)
+    px, py = bg.to_pixel(alt, velocity)
+    r = MARKER_RADIUS
+    draw.ellipse((px - r, py - r, px + r, py + r), outline='white', width=3)
+    return _to_png(img)
+
+
+def takeoff_image(mass, area, stall_v, xlabel, ylabel, wind=None):
+    """
+    PNG bytes of the takeoff chart: required speed vs wind for the current
+    stall speed, with the actual headwind (m/s) marked when given.
+    """
+    bg = _background(takeoff_background, mass, area, xlabel, ylabel)
+    img, draw = _draw(bg)
+    w0, w1 = WIND_RANGE
+    p0 = bg.to_pixel(w0, stall_v * TAKEOFF_FACTOR + w0)
+    p1 = bg.to_pixel(w1, stall_v * TAKEOFF_FACTOR + w1)
+    draw.line([p0, p1], fill=TAKEOFF_COLOR, width=3)
+    if wind is not None:
+        w = min(max(wind, w0), w1)
+        px, py = bg.to_pixel(w, stall_v * TAKEOFF_FACTOR + w)
+        r = MARKER_RADIUS
+        draw.ellipse((px - r, py - r, px + r, py + r), outline='white', width=3)
+    return _to_png(img)
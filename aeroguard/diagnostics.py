@@ -0,0 +1,153 @@
+"""
+AeroGuard Rerun Diagnostics
+---------------------------
+Lightweight timing spans and counters for one Streamlit rerun.
+
+A `Diagnostics` object is created at the top of each rerun. Hot-path
+sections are wrapped in `diag.span("name")` and counters are added with
+`diag.count()`. When disabled, `span()` hands back a shared no-op
+context manager and `count()` returns immediately, so the
+instrumentation costs next to nothing.
+
+Library code (weather client, chart caches) records what each call did
+with the module-level `count()`, which adds to the object made active
+for the current context by `active()` or `fragment()`. Counts therefore
+belong to the session and rerun that made the call, not to whatever else
+the process was doing at the time.
+
+At the end of the rerun `emit()` writes one JSON line per rerun to the
+`aeroguard.timing` logger. Fragment-only reruns (`st.fragment`) do not
+reach the end of the script, so `fragment()` hands them their own
+object that is emitted with the fragment name as its scope.
+
+Set AEROGUARD_TIMING_LOG to a file path (or "-" for stderr) to attach a
+handler, e.g. for a log shipper.
+"""
+
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import sys
+import time
+
+LOGGER_NAME = "aeroguard.timing"
+_NULL_SPAN = contextlib.nullcontext()
+_active = contextvars.ContextVar("aeroguard_diagnostics", default=None)
+_log_configured = False
+
+
+def timing_log_target():
+    """Destination configured via AEROGUARD_TIMING_LOG (None when unset)."""
+    return os.environ.get("AEROGUARD_TIMING_LOG") or None
+
+
+def get_logger():
+    """The JSON-lines logger, with a handler attached once if AEROGUARD_TIMING_LOG is set."""
+    global _log_configured
+    logger = logging.getLogger(LOGGER_NAME)
+    if not _log_configured:
+        _log_configured = True
+        target = timing_log_target()
+        if target:
+            handler = logging.StreamHandler(sys.stderr) if target == "-" else logging.FileHandler(target)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+    return logger
+
+
+def count(name, n=1):
+    """Adds to a counter of the Diagnostics active in this context; no-op without one."""
+    diag = _active.get()
+    if diag is not None and n:
+        diag.count(name, n)
+
+
+class _Span:
+    __slots__ = ("_diag", "_name", "_t0")
+
+    def __init__(self, diag, name):
+        self._diag = diag
+        self._name = name
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        spans = self._diag.spans
+        spans[self._name] = spans.get(self._name, 0.0) + time.perf_counter() - self._t0
+        return False
+
+
+class Diagnostics:
+    """Per-rerun collection of timing spans (seconds) and counters."""
+
+    def __init__(self, enabled=False, session=None, scope="app"):
+        self.enabled = enabled
+        self.session = session
+        self.scope = scope
+        self.emitted = False
+        self.spans = {}
+        self.counters = {}
+        self._t0 = time.perf_counter()
+
+    def span(self, name):
+        """Context manager timing a section; repeated spans with one name add up."""
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    @contextlib.contextmanager
+    def active(self):
+        """Makes this object the target of module-level `count()` calls in the current context."""
+        token = _active.set(self if self.enabled else None)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+    @contextlib.contextmanager
+    def fragment(self, name):
+        """
+        Diagnostics for a fragment body, active while it runs: this object
+        while the app run is still open, or a fresh one, emitted on exit,
+        when only the fragment reruns (this object was already emitted by
+        the last app run).
+        """
+        if not (self.enabled and self.emitted):
+            with self.active():
+                yield self
+            return
+        child = Diagnostics(self.enabled, self.session, scope=name)
+        try:
+            with child.active():
+                yield child
+        finally:
+            child.emit()
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        return {
+            "ts": round(time.time(), 3),
+            "session": self.session,
+            "scope": self.scope,
+            "total_ms": round((time.perf_counter() - self._t0) * 1000, 3),
+            "spans_ms": {k: round(v * 1000, 3) for k, v in self.spans.items()},
+            "counters": dict(self.counters),
+        }
+
+    def emit(self):
+        """Writes the summary as one JSON line to the timing logger. Returns it."""
+        if not self.enabled:
+            return None
+        self.emitted = True
+        record = self.summary()
+        logger = get_logger()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(record, separators=(",", ":")))
+        return record
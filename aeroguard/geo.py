@@ -0,0 +1,303 @@
+"""
+AeroGuard Geodesy Kernels
+-------------------------
+Vectorized distance, bearing, interpolation and cross-track kernels.
+
+Every kernel takes arrays of latitudes / longitudes in degrees and
+works on whole routes or batches at once. Two Earth models are offered:
+
+- spherical (default): closed-form great-circle formulas, fastest.
+- ellipsoidal (`ellipsoidal=True`): Vincenty on WGS-84. Distances agree
+  with `geopy.distance.geodesic` to within 1 mm; the rare nearly
+  antipodal pairs where Vincenty does not converge are solved with
+  geographiclib (which geopy itself uses).
+
+Tracks are (N, 2) float arrays of (lat, lon) degrees; distances along
+a track are cumulative metres from its first point.
+"""
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8  # Mean Earth radius
+
+# --- WGS-84 ---
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+VINCENTY_TOL = 1e-12
+VINCENTY_MAX_ITER = 200
+SMALL_BATCH = 8  # Below this many pairs, a scalar loop beats NumPy overhead
+
+
+def _slerp(lat1, lon1, lat2, lon2, f):
+    """Great-circle interpolation between point arrays (radians) at fractions `f`."""
+    c1, c2 = np.cos(lat1), np.cos(lat2)
+    p1 = np.stack([c1 * np.cos(lon1), c1 * np.sin(lon1), np.sin(lat1)], axis=-1)
+    p2 = np.stack([c2 * np.cos(lon2), c2 * np.sin(lon2), np.sin(lat2)], axis=-1)
+    omega = np.arccos(np.clip(np.sum(p1 * p2, axis=-1), -1.0, 1.0))
+    sin_omega = np.sin(omega)
+    tiny = sin_omega < 1e-12
+    safe = np.where(tiny, 1.0, sin_omega)
+    a = np.where(tiny, 1.0 - f, np.sin((1 - f) * omega) / safe)
+    b = np.where(tiny, f, np.sin(f * omega) / safe)
+    xyz = a[..., None] * p1 + b[..., None] * p2
+    lat = np.arctan2(xyz[..., 2], np.hypot(xyz[..., 0], xyz[..., 1]))
+    lon = np.arctan2(xyz[..., 1], xyz[..., 0])
+    return lat, lon
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Great-circle distance in metres between point arrays (degrees)."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    h = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def _spherical_bearing(lat1, lon1, lat2, lon2):
+    """Initial bearing (radians) between point arrays given in radians."""
+    dlon = lon2 - lon1
+    x = np.sin(dlon) * np.cos(lat2)
+    y = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return np.arctan2(x, y)
+
+
+# --- VINCENTY (WGS-84) ---
+def _vincenty_coeffs(cos2_alpha):
+    u2 = cos2_alpha * (WGS84_A ** 2 - WGS84_B ** 2) / WGS84_B ** 2
+    A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    return A, B
+
+
+def _delta_sigma(B, sin_s, cos_s, cos_2sm):
+    return B * sin_s * (cos_2sm + B / 4 * (cos_s * (-1 + 2 * cos_2sm ** 2)
+                                           - B / 6 * cos_2sm * (-3 + 4 * sin_s ** 2) * (-3 + 4 * cos_2sm ** 2)))
+
+
+def vincenty_inverse(lat1, lon1, lat2, lon2):
+    """
+    Ellipsoidal inverse problem for point arrays (degrees).
+    Returns (distance m, initial bearing deg, final bearing deg).
+    """
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (lat1, lon1, lat2, lon2)))
+    shape = lat1.shape
+    lat1, lon1, lat2, lon2 = (v.ravel() for v in (lat1, lon1, lat2, lon2))
+    if lat1.size < SMALL_BATCH:
+        out = np.array([_vincenty_scalar(*p) for p in zip(lat1.tolist(), lon1.tolist(),
+                                                           lat2.tolist(), lon2.tolist())]).reshape(-1, 3)
+        return out[:, 0].reshape(shape), out[:, 1].reshape(shape), out[:, 2].reshape(shape)
+
+    f = WGS84_F
+    L = np.radians(lon2 - lon1)
+    U1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    U2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+    sinU1, cosU1, sinU2, cosU2 = np.sin(U1), np.cos(U1), np.sin(U2), np.cos(U2)
+
+    lam = L.copy()
+    converged = np.zeros(L.shape, dtype=bool)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(VINCENTY_MAX_ITER):
+            sin_l, cos_l = np.sin(lam), np.cos(lam)
+            sin_s = np.hypot(cosU2 * sin_l, cosU1 * sinU2 - sinU1 * cosU2 * cos_l)
+            cos_s = sinU1 * sinU2 + cosU1 * cosU2 * cos_l
+            sigma = np.arctan2(sin_s, cos_s)
+            sin_a = np.where(sin_s > 0, cosU1 * cosU2 * sin_l / sin_s, 0.0)
+            cos2_a = 1 - sin_a ** 2
+            cos_2sm = np.where(cos2_a > 0, cos_s - 2 * sinU1 * sinU2 / cos2_a, 0.0)
+            C = f / 16 * cos2_a * (4 + f * (4 - 3 * cos2_a))
+            lam_new = L + (1 - C) * f * sin_a * (sigma + C * sin_s * (cos_2sm + C * cos_s * (-1 + 2 * cos_2sm ** 2)))
+            converged = np.abs(lam_new - lam) < VINCENTY_TOL
+            lam = lam_new
+            if converged.all():
+                break
+
+        A, B = _vincenty_coeffs(cos2_a)
+        dist = WGS84_B * A * (sigma - _delta_sigma(B, sin_s, cos_s, cos_2sm))
+        sin_l, cos_l = np.sin(lam), np.cos(lam)
+        az1 = np.degrees(np.arctan2(cosU2 * sin_l, cosU1 * sinU2 - sinU1 * cosU2 * cos_l)) % 360.0
+        az2 = np.degrees(np.arctan2(cosU1 * sin_l, -sinU1 * cosU2 + cosU1 * sinU2 * cos_l)) % 360.0
+
+    dist = np.where(sin_s == 0, 0.0, dist)
+    bad = ~converged | ~np.isfinite(dist)
+    if bad.any():
+        # Nearly antipodal: Vincenty does not converge, use Karney's method.
+        d_k, az1_k, az2_k = _karney_inverse(lat1, lon1, lat2, lon2, bad)
+        dist, az1, az2 = np.where(bad, d_k, dist), np.where(bad, az1_k, az1), np.where(bad, az2_k, az2)
+    return dist.reshape(shape), az1.reshape(shape), az2.reshape(shape)
+
+
+def _vincenty_scalar(lat1, lon1, lat2, lon2):
+    """Same as vincenty_inverse for one pair of Python floats, without NumPy overhead."""
+    f = WGS84_F
+    L = math.radians(lon2 - lon1)
+    U1 = math.atan((1 - f) * math.tan(math.radians(lat1)))
+    U2 = math.atan((1 - f) * math.tan(math.radians(lat2)))
+    sinU1, cosU1, sinU2, cosU2 = math.sin(U1), math.cos(U1), math.sin(U2), math.cos(U2)
+
+    lam = L
+    for _ in range(VINCENTY_MAX_ITER):
+        sin_l, cos_l = math.sin(lam), math.cos(lam)
+        sin_s = math.hypot(cosU2 * sin_l, cosU1 * sinU2 - sinU1 * cosU2 * cos_l)
+        if sin_s == 0:
+            return 0.0, 0.0, 0.0
+        cos_s = sinU1 * sinU2 + cosU1 * cosU2 * cos_l
+        sigma = math.atan2(sin_s, cos_s)
+        sin_a = cosU1 * cosU2 * sin_l / sin_s
+        cos2_a = 1 - sin_a ** 2
+        cos_2sm = cos_s - 2 * sinU1 * sinU2 / cos2_a if cos2_a > 0 else 0.0
+        C = f / 16 * cos2_a * (4 + f * (4 - 3 * cos2_a))
+        lam_new = L + (1 - C) * f * sin_a * (sigma + C * sin_s * (cos_2sm + C * cos_s * (-1 + 2 * cos_2sm ** 2)))
+        if abs(lam_new - lam) < VINCENTY_TOL:
+            lam = lam_new
+            break
+        lam = lam_new
+    else:
+        mask = np.ones(1, dtype=bool)
+        d, a1, a2 = _karney_inverse(np.array([lat1]), np.array([lon1]), np.array([lat2]), np.array([lon2]), mask)
+        return float(d[0]), float(a1[0]), float(a2[0])
+
+    A, B = _vincenty_coeffs(cos2_a)
+    dist = WGS84_B * A * (sigma - _delta_sigma(B, sin_s, cos_s, cos_2sm))
+    sin_l, cos_l = math.sin(lam), math.cos(lam)
+    az1 = math.degrees(math.atan2(cosU2 * sin_l, cosU1 * sinU2 - sinU1 * cosU2 * cos_l)) % 360.0
+    az2 = math.degrees(math.atan2(cosU1 * sin_l, -sinU1 * cosU2 + cosU1 * sinU2 * cos_l)) % 360.0
+    return dist, az1, az2
+
+
+def _karney_inverse(lat1, lon1, lat2, lon2, mask):
+    """Per-pair geographiclib solution for the masked entries of 1-D arrays."""
+    from geographiclib.geodesic import Geodesic
+    out = np.zeros((3, lat1.size))
+    for i in np.flatnonzero(mask):
+        g = Geodesic.WGS84.Inverse(float(lat1[i]), float(lon1[i]), float(lat2[i]), float(lon2[i]))
+        out[:, i] = g["s12"], g["azi1"] % 360.0, g["azi2"] % 360.0
+    return out[0], out[1], out[2]
+
+
+def vincenty_direct(lat1, lon1, bearing, dist):
+    """Ellipsoidal direct problem: destination (lat, lon) degrees from start, bearing (deg) and distance (m)."""
+    lat1, lon1, bearing, dist = np.broadcast_arrays(*(np.asarray(v, dtype=float)
+                                                      for v in (lat1, lon1, bearing, dist)))
+    f = WGS84_F
+    a1 = np.radians(bearing)
+    sin_a1, cos_a1 = np.sin(a1), np.cos(a1)
+    tanU1 = (1 - f) * np.tan(np.radians(lat1))
+    cosU1 = 1 / np.sqrt(1 + tanU1 ** 2)
+    sinU1 = tanU1 * cosU1
+    sigma1 = np.arctan2(tanU1, cos_a1)
+    sin_a = cosU1 * sin_a1
+    cos2_a = 1 - sin_a ** 2
+    A, B = _vincenty_coeffs(cos2_a)
+
+    sigma = dist / (WGS84_B * A)
+    for _ in range(VINCENTY_MAX_ITER):
+        cos_2sm = np.cos(2 * sigma1 + sigma)
+        sin_s, cos_s = np.sin(sigma), np.cos(sigma)
+        sigma_new = dist / (WGS84_B * A) + _delta_sigma(B, sin_s, cos_s, cos_2sm)
+        done = np.all(np.abs(sigma_new - sigma) < VINCENTY_TOL)
+        sigma = sigma_new
+        if done:
+            break
+
+    sin_s, cos_s = np.sin(sigma), np.cos(sigma)
+    cos_2sm = np.cos(2 * sigma1 + sigma)
+    x = sinU1 * sin_s - cosU1 * cos_s * cos_a1
+    lat2 = np.arctan2(sinU1 * cos_s + cosU1 * sin_s * cos_a1, (1 - f) * np.hypot(sin_a, x))
+    lam = np.arctan2(sin_s * sin_a1, cosU1 * cos_s - sinU1 * sin_s * cos_a1)
+    C = f / 16 * cos2_a * (4 + f * (4 - 3 * cos2_a))
+    L = lam - (1 - C) * f * sin_a * (sigma + C * sin_s * (cos_2sm + C * cos_s * (-1 + 2 * cos_2sm ** 2)))
+    lon2 = (lon1 + np.degrees(L) + 540.0) % 360.0 - 180.0
+    return np.degrees(lat2), lon2
+
+
+# --- PUBLIC KERNELS ---
+def distance(lat1, lon1, lat2, lon2, ellipsoidal=False):
+    """Distance in metres between point arrays (degrees)."""
+    if ellipsoidal:
+        return vincenty_inverse(lat1, lon1, lat2, lon2)[0]
+    return haversine(lat1, lon1, lat2, lon2)
+
+
+def initial_bearing(lat1, lon1, lat2, lon2, ellipsoidal=False):
+    """Initial bearing from point 1 to point 2, degrees clockwise from north."""
+    if ellipsoidal:
+        return vincenty_inverse(lat1, lon1, lat2, lon2)[1]
+    r = [np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2)]
+    return np.degrees(_spherical_bearing(*r)) % 360.0
+
+
+def final_bearing(lat1, lon1, lat2, lon2, ellipsoidal=False):
+    """Bearing on arrival at point 2 when coming from point 1, degrees clockwise from north."""
+    if ellipsoidal:
+        return vincenty_inverse(lat1, lon1, lat2, lon2)[2]
+    r = [np.radians(np.asarray(v, dtype=float)) for v in (lat2, lon2, lat1, lon1)]
+    return (np.degrees(_spherical_bearing(*r)) + 180.0) % 360.0
+
+
+def intermediate(lat1, lon1, lat2, lon2, fraction, ellipsoidal=False):
+    """
+    Point at `fraction` (0 = point 1, 1 = point 2) of the way along the
+    great circle / geodesic between point arrays. Returns (lat, lon) degrees.
+    """
+    if ellipsoidal:
+        dist, az1, _ = vincenty_inverse(lat1, lon1, lat2, lon2)
+        return vincenty_direct(lat1, lon1, az1, dist * np.asarray(fraction, dtype=float))
+    r = [np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2)]
+    lat, lon = _slerp(*r, np.asarray(fraction, dtype=float))
+    return np.degrees(lat), np.degrees(lon)
+
+
+def cross_track_distance(lat, lon, lat1, lon1, lat2, lon2):
+    """
+    Signed distance (m) of points from the great circle through point 1
+    and point 2; positive to the right of the direction of travel.
+    Spherical model only.
+    """
+    d13 = haversine(lat1, lon1, lat, lon) / EARTH_RADIUS_M
+    lat, lon, lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float))
+                                        for v in (lat, lon, lat1, lon1, lat2, lon2))
+    theta13 = _spherical_bearing(lat1, lon1, lat, lon)
+    theta12 = _spherical_bearing(lat1, lon1, lat2, lon2)
+    return np.arcsin(np.clip(np.sin(d13) * np.sin(theta13 - theta12), -1.0, 1.0)) * EARTH_RADIUS_M
+
+
+# --- TRACKS ---
+def as_track(points):
+    """Coerces a sequence of (lat, lon) pairs to a contiguous (N, 2) float64 array."""
+    track = np.ascontiguousarray(points, dtype=np.float64)
+    return track.reshape(-1, 2)
+
+
+def cumulative_distance(track, ellipsoidal=True):
+    """Distance (m) from the first point to every point of the track."""
+    track = as_track(track)
+    seg = distance(track[:-1, 0], track[:-1, 1], track[1:, 0], track[1:, 1], ellipsoidal=ellipsoidal)
+    return np.concatenate(([0.0], np.cumsum(seg)))
+
+
+def positions_along(track, cum_dist, dist):
+    """
+    (lat, lon) degrees at distances `dist` (m) along a track, given its
+    `cum_dist` from cumulative_distance(). Returns an (n, 2) array.
+    """
+    track = as_track(track)
+    d = np.atleast_1d(np.asarray(dist, dtype=float))
+    if len(track) == 1:
+        return np.repeat(track, d.size, axis=0)
+    d = np.clip(d, 0.0, cum_dist[-1])
+    seg = np.clip(np.searchsorted(cum_dist, d, side="right") - 1, 0, len(track) - 2)
+    seg_len = cum_dist[seg + 1] - cum_dist[seg]
+    f = np.where(seg_len > 0, (d - cum_dist[seg]) / np.where(seg_len > 0, seg_len, 1.0), 0.0)
+    rad = np.radians(track)
+    lat, lon = _slerp(rad[seg, 0], rad[seg, 1], rad[seg + 1, 0], rad[seg + 1, 1], f)
+    return np.degrees(np.column_stack([lat, lon]))
+
+
+def resample_track(track, n):
+    """`n` points evenly spaced by distance along the track (ends included)."""
+    track = as_track(track)
+    cum = cumulative_distance(track)
+    return positions_along(track, cum, np.linspace(0.0, cum[-1], n))
@@ -0,0 +1,138 @@
+"""
+AeroGuard Translations
+----------------------
+UI strings for the six supported languages, keyed by language code.
+Plain data, so it can be imported without Streamlit.
+"""
+
+# --- INTERNATIONALIZATION (I18N) DICTIONARY ---
+TRANSLATIONS = {
+    "TR": {
+        "tabs": ["🗺️ Rota Planlama", "✈️ Teknik Özellikler", "📊 Mühendislik Analizi", "🚀 Simülasyon"],
+        "cockpit": "Kokpit Paneli", "aircraft": "Uçak Seçimi",
+        "params": "Uçuş Parametreleri", "alt": "İrtifa (m)", "spd": "Hız (m/s)",
+        "specs_title": "Teknik Veri Kartı", "mass": "Kütle", "area": "Kanat Alanı (m²)", "span": "Kanat Açıklığı", "len": "Uzunluk", "eng": "Motor",
+        "env_title": "Uçuş Zarfı Analizi", "safety_title": "Güvenlik Haritası (İrtifa × Hız)",
+        "env_desc": "Güvenli uçuş sınırlarını gösterir. Çizginin altı Stall bölgesidir.",
+        "wind_title": "Kalkış Performansı",
+        "wind_desc": "Rüzgar yönünün kalkış hızına etkisi. Karşı rüzgar avantaj sağlar.",
+        "start": "UÇUŞU BAŞLAT", "reset": "Rotayı Temizle",
+        "import_track": "İz Dosyası Yükle (GPX/CSV)",
+        "no_route": "⚠️ Rota oluşturulmadı! Lütfen harita sekmesinden en az 2 nokta seçiniz.",
+        "click_map": "Başlangıç ve Bitiş noktalarını belirlemek için haritaya tıklayın.",
+        "waiting_data": "Veri bekleniyor...", "weather_title": "Atmosferik Veriler",
+        "route_weather": "Rota Boyunca Hava",
+        "sim_running": "Simülasyon Yürütülüyor...", "sim_done": "Operasyon Başarıyla Tamamlandı",
+        "fuel": "Yakıt (kg)", "dist": "Mesafe (km)", "replay": "Tekrar Oynat (adım)", "export": "Telemetriyi İndir",
+        "crash_alt_high": "🚨 KRİTİK HATA: İrtifa Limiti Aşıldı (Motorlar Durdu)!",
+        "crash_alt_low": "🚨 KRİTİK HATA: Aşırı Alçak İrtifada Yüksek Hız (Yapısal Hasar)!",
+        "crash_stall": "🚨 KRİTİK HATA: Stall Hızı! (Tutunma Kaybı)",
+        "crash_struct": "🚨 KRİTİK HATA: Yapısal Hız Limiti Aşıldı! (Gövde Parçalandı)",
+        "sim_failed": "OPERASYON BAŞARISIZ"
+    },
+    "EN": {
+        "tabs": ["🗺️ Route Planning", "✈️ Tech Specs", "📊 Engineering Analysis", "🚀 Simulation"],
+        "cockpit": "Cockpit Panel", "aircraft": "Select Aircraft",
+        "params": "Flight Parameters", "alt": "Altitude (m)", "spd": "Speed (m/s)",
+        "specs_title": "Technical Data Sheet", "mass": "Mass", "area": "Wing Area (m²)", "span": "Wingspan", "len": "Length", "eng": "Engine",
+        "env_title": "Flight Envelope", "env_desc": "Shows safe flight limits. Below line is Stall zone.", "safety_title": "Safety Map (Altitude × Speed)",
+        "wind_title": "Takeoff Performance", "wind_desc": "Effect of wind on takeoff speed. Headwind is advantageous.",
+        "start": "START FLIGHT", "reset": "Clear Route",
+        "import_track": "Import Track (GPX/CSV)",
+        "no_route": "⚠️ No route created! Please select at least 2 points on the map tab.",
+        "click_map": "Click on the map to set Start and End points.",
+        "waiting_data": "Waiting for data...", "weather_title": "Atmospheric Data",
+        "route_weather": "Weather Along Route",
+        "sim_running": "Simulation Running...", "sim_done": "Operation Complete",
+        "fuel": "Fuel (kg)", "dist": "Distance (km)", "replay": "Replay (step)", "export": "Download Telemetry",
+        "crash_alt_high": "🚨 CRITICAL ERROR: Ceiling Exceeded (Flameout)!",
+        "crash_alt_low": "🚨 CRITICAL ERROR: Low Altitude Overspeed (Structural Failure)!",
+        "crash_stall": "🚨 CRITICAL ERROR: Stall Speed (Lift Lost)!",
+        "crash_struct": "🚨 CRITICAL ERROR: Vne Exceeded (Airframe Damage)!",
+        "sim_failed": "OPERATION FAILED"
+    },
+    "DE": {
+        "tabs": ["🗺️ Routenplanung", "✈️ Technische Daten", "📊 Analyse", "🚀 Simulation"],
+        "cockpit": "Cockpit-Panel", "aircraft": "Flugzeugwahl",
+        "params": "Flugparameter", "alt": "Höhe (m)", "spd": "Geschw. (m/s)",
+        "specs_title": "Datenblatt", "mass": "Masse", "span": "Spannweite", "area": "Flügelfläche (m²)", "len": "Länge", "eng": "Motor",
+        "env_title": "Flugbereich", "env_desc": "Zeigt sichere Grenzen. Unter der Linie ist Stall-Bereich.", "safety_title": "Sicherheitskarte (Höhe × Geschwindigkeit)",
+        "wind_title": "Startleistung", "wind_desc": "Windeinfluss auf Startgeschw. Gegenwind ist vorteilhaft.",
+        "start": "STARTEN", "reset": "Route Löschen",
+        "import_track": "Track importieren (GPX/CSV)",
+        "no_route": "⚠️ Keine Route! Bitte wählen Sie mindestens 2 Punkte auf der Karte.",
+        "click_map": "Klicken Sie auf die Karte, um Start und Ziel festzulegen.",
+        "waiting_data": "Warte auf Daten...", "weather_title": "Atmosphärische Daten",
+        "route_weather": "Wetter entlang der Route",
+        "sim_running": "Simulation läuft...", "sim_done": "Operation Abgeschlossen",
+        "fuel": "Kraftstoff (kg)", "dist": "Strecke (km)", "replay": "Wiedergabe (Schritt)", "export": "Telemetrie herunterladen",
+        "crash_alt_high": "🚨 KRITISCHER FEHLER: Dienstgipfelhöhe überschritten!",
+        "crash_alt_low": "🚨 KRITISCHER FEHLER: Zu schnell in Bodennähe!",
+        "crash_stall": "🚨 KRITISCHER FEHLER: Strömungsabriss (Stall)!",
+        "crash_struct": "🚨 KRITISCHER FEHLER: Geschwindigkeitslimit überschritten!",
+        "sim_failed": "OPERATION FEHLGESCHLAGEN"
+    },
+    "FR": {
+        "tabs": ["🗺️ Planification", "✈️ Spécifications", "📊 Analyse", "🚀 Simulation"],
+        "cockpit": "Panneau Cockpit", "aircraft": "Choix Avion",
+        "params": "Paramètres", "alt": "Altitude (m)", "spd": "Vitesse (m/s)",
+        "specs_title": "Fiche Technique", "mass": "Masse", "span": "Envergure", "area": "Surface Alaire (m²)", "len": "Longueur", "eng": "Moteur",
+        "env_title": "Domaine de Vol", "env_desc": "Limites de sécurité. Zone de décrochage sous la ligne.", "safety_title": "Carte de Sécurité (Altitude × Vitesse)",
+        "wind_title": "Performance Décollage", "wind_desc": "Effet du vent. Le vent de face est avantageux.",
+        "start": "DÉMARRER", "reset": "Effacer",
+        "import_track": "Importer une trace (GPX/CSV)",
+        "no_route": "⚠️ Pas de route! Sélectionnez au moins 2 points sur la carte.",
+        "click_map": "Cliquez sur la carte pour définir le départ et l'arrivée.",
+        "waiting_data": "En attente...", "weather_title": "Données Atmosphériques",
+        "route_weather": "Météo le long de la route",
+        "sim_running": "Simulation en cours...", "sim_done": "Opération Terminée",
+        "fuel": "Carburant (kg)", "dist": "Distance (km)", "replay": "Relecture (pas)", "export": "Télécharger la télémétrie",
+        "crash_alt_high": "🚨 ERREUR CRITIQUE: Plafond dépassé!",
+        "crash_alt_low": "🚨 ERREUR CRITIQUE: Survitesse à basse altitude!",
+        "crash_stall": "🚨 ERREUR CRITIQUE: Décrochage!",
+        "crash_struct": "🚨 ERREUR CRITIQUE: Vitesse structurelle dépassée!",
+        "sim_failed": "ÉCHEC DE L'OPÉRATION"
+    },
+    "RU": {
+        "tabs": ["🗺️ Маршрут", "✈️ Характеристики", "📊 Анализ", "🚀 Симуляция"],
+        "cockpit": "Панель Кабины", "aircraft": "Выбор Самолета",
+        "params": "Параметры", "alt": "Высота (м)", "spd": "Скорость (м/с)",
+        "specs_title": "Тех. Паспорт", "mass": "Масса", "area": "Площадь Крыла (м²)", "span": "Размах", "len": "Длина", "eng": "Двигатель",
+        "env_title": "Огибающая Полета", "env_desc": "Безопасные границы. Ниже линии - сваливание.", "safety_title": "Карта Безопасности (Высота × Скорость)",
+        "wind_title": "Взлетные Хар-ки", "wind_desc": "Влияние ветра. Встречный ветер выгоден.",
+        "start": "СТАРТ", "reset": "Сброс",
+        "import_track": "Импорт трека (GPX/CSV)",
+        "no_route": "⚠️ Нет маршрута! Выберите не менее 2 точек на карте.",
+        "click_map": "Нажмите на карту для выбора точек.",
+        "waiting_data": "Ожидание данных...", "weather_title": "Атмосферные Данные",
+        "route_weather": "Погода по маршруту",
+        "sim_running": "Симуляция запущена...", "sim_done": "Операция Завершена",
+        "fuel": "Топливо (кг)", "dist": "Дистанция (км)", "replay": "Повтор (шаг)", "export": "Скачать телеметрию",
+        "crash_alt_high": "🚨 КРИТИЧЕСКАЯ ОШИБКА: Превышен потолок!",
+        "crash_alt_low": "🚨 КРИТИЧЕСКАЯ ОШИБКА: Превышение скорости у земли!",
+        "crash_stall": "🚨 КРИТИЧЕСКАЯ ОШИБКА: Сваливание!",
+        "crash_struct": "🚨 КРИТИЧЕСКАЯ ОШИБКА: Разрушение конструкции!",
+        "sim_failed": "ОПЕРАЦИЯ ПРОВАЛЕНА"
+    },
+    "JP": {
+        "tabs": ["🗺️ ルート計画", "✈️ 機体仕様", "📊 分析", "🚀 シミュレーション"],
+        "cockpit": "コックピット", "aircraft": "機体選択",
+        "params": "飛行パラメータ", "alt": "高度 (m)", "spd": "速度 (m/s)",
+        "specs_title": "技術データ", "mass": "質量", "area": "翼面積 (m²)", "span": "翼幅", "len": "全長", "eng": "エンジン",
+        "env_title": "飛行包絡線", "env_desc": "安全限界を示します。線の下は失速領域です。", "safety_title": "安全マップ (高度 × 速度)",
+        "wind_title": "離陸性能", "wind_desc": "風の影響。向かい風は離陸に有利です。",
+        "start": "開始", "reset": "リセット",
+        "import_track": "トラックを読み込む (GPX/CSV)",
+        "no_route": "⚠️ ルートがありません！地図上で2点以上を選択してください。",
+        "click_map": "地図をクリックして始点と終点を設定してください。",
+        "waiting_data": "データ待機中...", "weather_title": "気象データ",
+        "route_weather": "ルート沿いの気象",
+        "sim_running": "シミュレーション実行中...", "sim_done": "作戦完了",
+        "fuel": "燃料 (kg)", "dist": "距離 (km)", "replay": "リプレイ (ステップ)", "export": "テレメトリをダウンロード",
+        "crash_alt_high": "🚨 致命的エラー: 上昇限度超過!",
+        "crash_alt_low": "🚨 致命的エラー: 低高度での速度超過!",
+        "crash_stall": "🚨 致命的エラー: 失速 (ストール)!",
+        "crash_struct": "🚨 致命的エラー: 構造限界速度超過!",
+        "sim_failed": "作戦失敗"
+    }
+}
@@ -0,0 +1,96 @@
+"""
+AeroGuard Map Layers
+--------------------
+Folium building blocks for the route planning tab.
+
+The base map is created once per session and never changes, so
+`st_folium` keeps the same map document in the browser. Everything that
+does change (start/end markers, the route line and the aircraft icon)
+is built as a small FeatureGroup and pushed through
+`st_folium(feature_group_to_add=...)` as a delta. Aircraft icons are
+read and base64-encoded once per process and shared by all sessions.
+
+Long tracks are drawn with a Douglas-Peucker polyline simplified for
+the current zoom level (cached per track and zoom), so the layer stays
+small however many fixes the route has. Folium is imported on first use.
+"""
+
+import base64
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from aeroguard import tracks
+
+# --- DEFAULTS ---
+BASE_LOCATION = [39.0, 35.0]
+BASE_ZOOM = 5
+BASE_TILES = "OpenStreetMap"
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+ICON_SIZE = (45, 45)
+MAX_WAYPOINT_MARKERS = 50  # Intermediate waypoints drawn as dots up to this count
+LOD_CACHE_SIZE = 64
+
+_lod_cache = OrderedDict()
+_lod_lock = threading.Lock()
+
+
+def image_to_base64(img_path):
+    """Converts a local image to Base64 for embedding in Folium maps."""
+    try:
+        with open(img_path, "rb") as f:
+            return base64.b64encode(f.read()).decode('utf-8')
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=64)
+def icon_data_uri(icon_name):
+    """Data URI for an icon in images/, encoded once per process (None if missing)."""
+    b64 = image_to_base64(os.path.join(IMAGE_DIR, icon_name))
+    return f"data:image/png;base64,{b64}" if b64 else None
+
+
+def make_base_map():
+    """Static base map; build once and reuse it across reruns."""
+    import folium
+
+    return folium.Map(location=BASE_LOCATION, zoom_start=BASE_ZOOM, tiles=BASE_TILES)
+
+
+def display_polyline(track, zoom):
+    """Zoom-dependent simplified polyline for a track, cached per (track, zoom)."""
+    key = (hashlib.blake2b(track.tobytes(), digest_size=16).digest(), len(track), int(zoom))
+    with _lod_lock:
+        if key in _lod_cache:
+            _lod_cache.move_to_end(key)
+            return _lod_cache[key]
+    line = tracks.simplify_for_zoom(track, zoom).tolist()
+    with _lod_lock:
+        _lod_cache[key] = line
+        while len(_lod_cache) > LOD_CACHE_SIZE:
+            _lod_cache.popitem(last=False)
+    return line
+
+
+def route_layer(route, icon_name=None, zoom=BASE_ZOOM):
+    """Dynamic layer with the start/end markers, route line and aircraft icon."""
+    import folium
+
+    fg = folium.FeatureGroup(name="route")
+    if len(route) > 0:
+        folium.Marker(route[0].tolist(), icon=folium.Icon(color="green", icon="play")).add_to(fg)
+    if len(route) >= 2:
+        folium.Marker(route[-1].tolist(), icon=folium.Icon(color="red", icon="flag")).add_to(fg)
+        folium.PolyLine(display_polyline(route, zoom), color="blue", weight=4).add_to(fg)
+        if len(route) - 2 <= MAX_WAYPOINT_MARKERS:
+            for pt in route[1:-1]:
+                folium.CircleMarker(pt.tolist(), radius=4, color="blue", fill=True).add_to(fg)
+
+        # Custom Aircraft Icon
+        uri = icon_data_uri(icon_name) if icon_name else None
+        if uri:
+            folium.Marker(route[0].tolist(), icon=folium.CustomIcon(uri, icon_size=ICON_SIZE)).add_to(fg)
+    return fg
@@ -0,0 +1,95 @@
+"""
+AeroGuard Physics Core
+----------------------
+Vectorized atmosphere, stall speed and flight envelope checks.
+
+Every function accepts scalars or NumPy arrays and broadcasts them, so
+the same rules the UI applies to one (altitude, velocity) pair can be
+applied to millions of samples from a flight log in a single call.
+"""
+
+import numpy as np
+
+# --- CONSTANTS ---
+RHO_SEA_LEVEL = 1.225  # kg/m^3
+SCALE_HEIGHT = 8500.0  # m, exponential atmosphere
+GRAVITY = 9.81  # m/s^2
+CL_MAX = 1.6  # Max lift coefficient used for stall speed
+LOW_ALT_THRESHOLD = 1000.0  # m, below this the low_alt_limit applies
+DEFAULT_LOW_ALT_LIMIT = 200.0  # m/s, used when a profile has none
+
+# --- CRASH CODES ---
+# Order matches the rule priority in the simulation tab.
+OK = 0
+ALT_HIGH = 1
+STALL = 2
+STRUCT = 3
+ALT_LOW_SPEED = 4
+CRASH_NAMES = (None, "ALT_HIGH", "STALL", "STRUCT", "ALT_LOW_SPEED")
+
+
+def air_density(alt):
+    """Air density (kg/m^3) from the exponential atmosphere model."""
+    return RHO_SEA_LEVEL * np.exp(-np.asarray(alt, dtype=float) / SCALE_HEIGHT)
+
+
+def stall_speed(alt, mass, area):
+    """Stall speed (m/s) at the given altitude(s) for mass (kg) and wing area (m^2)."""
+    area = np.asarray(area, dtype=float)
+    area = np.where(area > 0, area, 1.0)
+    return np.sqrt((2 * np.asarray(mass, dtype=float) * GRAVITY) / (air_density(alt) * area * CL_MAX))
+
+
+def profile_arrays(ac):
+    """Extracts the envelope parameters of an AIRCRAFT_DB entry as float arrays."""
+    return {
+        "mass": np.asarray(ac["mass"], dtype=float),
+        "area": np.asarray(ac["area"], dtype=float),
+        "ceiling": np.asarray(ac["ceiling"], dtype=float),
+        "speed_limit": np.asarray(ac["speed_limit"], dtype=float),
+        "low_alt_limit": np.asarray(ac.get("low_alt_limit", DEFAULT_LOW_ALT_LIMIT), dtype=float),
+    }
+
+
+def crash_codes(alt, vel, ac, stall_v=None):
+    """
+    Applies the four crash rules to every (altitude, velocity) sample.
+
+    `ac` is an AIRCRAFT_DB-style mapping whose values may be scalars or
+    arrays broadcastable against `alt` / `vel` (e.g. one row per sample
+    for mixed-aircraft logs). Returns an int8 array of crash codes where
+    the first matching rule wins: ALT_HIGH, STALL, STRUCT, ALT_LOW_SPEED.
+    """
+    conditions = rule_violations(alt, vel, ac, stall_v=stall_v)
+    return np.select(conditions, [ALT_HIGH, STALL, STRUCT, ALT_LOW_SPEED], OK).astype(np.int8)
+
+
+def rule_violations(alt, vel, ac, stall_v=None):
+    """
+    Each crash rule evaluated on its own: a list of boolean arrays in
+    code order (ALT_HIGH, STALL, STRUCT, ALT_LOW_SPEED), so a sample can
+    violate several rules at once.
+    """
+    p = profile_arrays(ac)
+    alt = np.asarray(alt, dtype=float)
+    vel = np.asarray(vel, dtype=float)
+    if stall_v is None:
+        stall_v = stall_speed(alt, p["mass"], p["area"])
+    return [
+        alt > p["ceiling"],
+        vel < stall_v,
+        vel > p["speed_limit"],
+        (alt < LOW_ALT_THRESHOLD) & (vel > p["low_alt_limit"]),
+    ]
+
+
+def check_envelope(alt, vel, ac):
+    """Batch envelope check. Returns (stall_speeds, crash_codes) arrays."""
+    p = profile_arrays(ac)
+    stall_v = stall_speed(alt, p["mass"], p["area"])
+    return stall_v, crash_codes(alt, vel, ac, stall_v=stall_v)
+
+
+def crash_name(code):
+    """Maps a crash code to the name used by the UI (None when safe)."""
+    return CRASH_NAMES[int(code)]
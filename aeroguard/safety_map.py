@@ -0,0 +1,109 @@
+"""
+AeroGuard Safety Map
+--------------------
+Altitude x airspeed map of the envelope rules for one aircraft profile.
+
+Every cell of a fine grid gets the crash code the simulation would
+raise there (`physics.crash_codes`, first matching rule wins). Rather
+than evaluating every cell, the grid is refined quadtree-style: coarse
+cells are sampled at their corners and centre, cells where all samples
+agree are filled in one go, and only cells straddling a rule boundary
+are split further. The work grows with the length of the boundaries,
+not with the area of the map.
+
+Features thinner than a base cell (e.g. a ceiling a few metres above
+zero) can be missed by the corner sampling, so the base grid is kept
+fine enough for real profiles. Maps are cached per envelope, so custom
+aircraft are computed once per set of inputs.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from aeroguard import physics
+
+ALT_RANGE = (0.0, 16000.0)  # m, same span as the flight envelope chart
+SPEED_RANGE = (0.0, 700.0)  # m/s
+BASE_CELLS = 32  # cells per axis before refinement
+MAX_LEVEL = 5  # refinements; the final grid has BASE_CELLS * 2**MAX_LEVEL cells per axis
+ENVELOPE_KEYS = ("mass", "area", "ceiling", "speed_limit", "low_alt_limit")
+
+
+@dataclass(frozen=True)
+class SafetyMap:
+    """Crash code per cell; row 0 is the lowest speed, column 0 the lowest altitude."""
+    codes: np.ndarray  # (n, n) int8, read-only
+    alt_range: tuple
+    speed_range: tuple
+    evaluations: int  # envelope checks performed
+
+    @property
+    def cells(self):
+        return self.codes.size
+
+
+def envelope_key(ac):
+    """Hashable envelope of a profile; two profiles with equal keys share a map."""
+    p = physics.profile_arrays(ac)
+    return tuple(float(p[k]) for k in ENVELOPE_KEYS)
+
+
+def _corner_codes(env, alt_c, spd_c, i0, j0, size):
+    """Codes at the four corner and the centre fine cells of each (i0, j0, size) cell."""
+    s1, h = size - 1, size // 2
+    rows = np.stack([i0, i0, i0 + s1, i0 + s1, i0 + h])
+    cols = np.stack([j0, j0 + s1, j0, j0 + s1, j0 + h])
+    return physics.crash_codes(alt_c[cols], spd_c[rows], env)
+
+
+def _refine(env, alt_range, speed_range, base, max_level):
+    n = base << max_level
+    alt_c = alt_range[0] + (np.arange(n) + 0.5) * (alt_range[1] - alt_range[0]) / n
+    spd_c = speed_range[0] + (np.arange(n) + 0.5) * (speed_range[1] - speed_range[0]) / n
+    codes = np.empty((n, n), dtype=np.int8)
+    evaluations = 0
+
+    size = 1 << max_level
+    i0, j0 = (a.ravel() * size for a in np.meshgrid(np.arange(base), np.arange(base), indexing="ij"))
+    while i0.size:
+        if size == 1:
+            codes[i0, j0] = physics.crash_codes(alt_c[j0], spd_c[i0], env)
+            evaluations += i0.size
+            break
+
+        samples = _corner_codes(env, alt_c, spd_c, i0, j0, size)
+        evaluations += samples.size
+        uniform = (samples == samples[0]).all(axis=0)
+        # Uniform cells are written straight into their size x size block.
+        blocks = codes.reshape(n // size, size, n // size, size)
+        blocks[i0[uniform] // size, :, j0[uniform] // size, :] = samples[0, uniform][:, None, None]
+
+        # Split the rest into four children.
+        i0, j0 = i0[~uniform], j0[~uniform]
+        size //= 2
+        i0 = np.concatenate([i0, i0, i0 + size, i0 + size])
+        j0 = np.concatenate([j0, j0 + size, j0, j0 + size])
+
+    codes.flags.writeable = False
+    return codes, evaluations
+
+
+@lru_cache(maxsize=64)
+def _cached_map(key, alt_range, speed_range, base, max_level):
+    env = dict(zip(ENVELOPE_KEYS, key))
+    codes, evaluations = _refine(env, alt_range, speed_range, base, max_level)
+    return SafetyMap(codes=codes, alt_range=alt_range, speed_range=speed_range, evaluations=evaluations)
+
+
+def safety_map(ac, alt_range=ALT_RANGE, speed_range=SPEED_RANGE, base=BASE_CELLS, max_level=MAX_LEVEL):
+    """Adaptive crash-code map for a profile, cached per envelope."""
+    return _cached_map(envelope_key(ac), tuple(alt_range), tuple(speed_range), base, max_level)
+
+
+def full_map(ac, alt_range=ALT_RANGE, speed_range=SPEED_RANGE, n=BASE_CELLS << MAX_LEVEL):
+    """Reference map evaluating every cell; for checking the adaptive one."""
+    alt_c = alt_range[0] + (np.arange(n) + 0.5) * (alt_range[1] - alt_range[0]) / n
+    spd_c = speed_range[0] + (np.arange(n) + 0.5) * (speed_range[1] - speed_range[0]) / n
+    return physics.crash_codes(alt_c[None, :], spd_c[:, None], ac)
@@ -0,0 +1,219 @@
+"""
+AeroGuard Batch Mission Sweep
+-----------------------------
+Headless command-line runner that flies a whole mission matrix through
+the flight integrator on all CPU cores.
+
+The matrix is either a CSV / JSON list of missions (one per row) or a
+JSON grid whose lists are expanded as a cartesian product:
+
+    {"aircraft": ["Boeing 737-800", "Cessna 172 Skyhawk"],
+     "routes": [[41.0, 29.0, 39.9, 32.8]],
+     "cruise_alt": [3000, 8000], "speed": [60, 220]}
+
+Mission rows use the columns aircraft, start_lat, start_lon, end_lat,
+end_lon, cruise_alt, speed and optionally headwind plus any envelope key
+(mass, area, ceiling, fuel_rate, speed_limit, low_alt_limit) to override
+the aircraft profile. Missions are read, simulated and written in chunks,
+so memory stays flat regardless of matrix size.
+
+Usage:
+    python -m aeroguard.sweep missions.csv -o results.csv
+    python -m aeroguard.sweep grid.json -o results.parquet --workers 8
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from aeroguard import physics
+from aeroguard.aircraft import AIRCRAFT_DB
+from aeroguard.simulation import simulate
+
+DEFAULT_CHUNK_SIZE = 500
+PROGRESS_INTERVAL = 0.5  # s between progress line updates
+ENVELOPE_KEYS = ("mass", "area", "ceiling", "fuel_rate", "speed_limit", "low_alt_limit")
+RESULT_FIELDS = ("mission", "aircraft", "crash_type", "crash_time", "stall_margin",
+                 "route_km", "distance_km", "flight_time", "fuel")
+
+
+# --- MISSION INPUT ---
+def _grid_missions(spec):
+    """Expands a JSON grid specification into mission dicts, lazily."""
+    aircraft = spec.get("aircraft") or list(AIRCRAFT_DB.keys())
+    headwinds = spec.get("headwind", [0.0])
+    for name, route, alt, speed, wind in itertools.product(
+            aircraft, spec["routes"], spec["cruise_alt"], spec["speed"], headwinds):
+        yield {"aircraft": name, "start_lat": route[0], "start_lon": route[1],
+               "end_lat": route[2], "end_lon": route[3],
+               "cruise_alt": alt, "speed": speed, "headwind": wind}
+
+
+def grid_size(spec):
+    aircraft = spec.get("aircraft") or AIRCRAFT_DB
+    return (len(aircraft) * len(spec["routes"]) * len(spec["cruise_alt"])
+            * len(spec["speed"]) * len(spec.get("headwind", [0.0])))
+
+
+def read_missions(path):
+    """
+    Returns (iterator of mission dicts, total or None). CSV files are
+    streamed row by row; JSON may be a list of missions or a grid spec.
+    """
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return _grid_missions(data), grid_size(data)
+        return iter(data), len(data)
+
+    def rows():
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    return rows(), None
+
+
+def _chunks(iterable, size):
+    it = enumerate(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# --- WORKER ---
+def _profile(mission):
+    """Aircraft profile for a mission, with any per-row envelope overrides."""
+    overrides = {key: float(mission[key]) for key in ENVELOPE_KEYS if mission.get(key) not in (None, "")}
+    return AIRCRAFT_DB.profile(mission["aircraft"], **overrides)
+
+
+def run_mission(index, mission):
+    """Flies one mission and returns a result row (tuple in RESULT_FIELDS order)."""
+    start = (float(mission["start_lat"]), float(mission["start_lon"]))
+    end = (float(mission["end_lat"]), float(mission["end_lon"]))
+    wind = mission.get("headwind")
+    result = simulate((start, end), _profile(mission), float(mission["cruise_alt"]), float(mission["speed"]),
+                      headwind=float(wind) if wind not in (None, "") else 0.0)
+    crash_time = float(result.t[result.crash_step]) if result.crash_code != physics.OK else None
+    return (index, mission["aircraft"], result.crash_type or "OK", crash_time,
+            float(np.min(result.speed - result.stall_v)),
+            result.route_length / 1000.0, float(result.dist[-1]) / 1000.0,
+            float(result.t[-1]), float(result.fuel[-1]))
+
+
+def _run_chunk(chunk):
+    rows = []
+    for index, mission in chunk:
+        try:
+            rows.append(run_mission(index, mission))
+        except (KeyError, ValueError, TypeError) as e:
+            rows.append((index, mission.get("aircraft"), f"ERROR: {e}", None, None, None, None, None, None))
+    return rows
+
+
+# --- OUTPUT ---
+class CsvSink:
+    def __init__(self, path):
+        self._f = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+        self._w = csv.writer(self._f)
+        self._w.writerow(RESULT_FIELDS)
+
+    def write(self, rows):
+        self._w.writerows(rows)
+
+    def close(self):
+        if self._f is not sys.stdout:
+            self._f.close()
+
+
+class ParquetSink:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow. Please run: pip install pyarrow")
+        self._pa = pa
+        self._schema = pa.schema([
+            ("mission", pa.int64()), ("aircraft", pa.string()), ("crash_type", pa.string()),
+            ("crash_time", pa.float64()), ("stall_margin", pa.float64()), ("route_km", pa.float64()),
+            ("distance_km", pa.float64()), ("flight_time", pa.float64()), ("fuel", pa.float64()),
+        ])
+        self._w = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows):
+        columns = list(zip(*rows))
+        self._w.write_table(self._pa.Table.from_arrays(
+            [self._pa.array(c, type=f.type) for c, f in zip(columns, self._schema)], schema=self._schema))
+
+    def close(self):
+        self._w.close()
+
+
+def open_sink(path):
+    return ParquetSink(path) if path.lower().endswith(".parquet") else CsvSink(path)
+
+
+# --- DRIVER ---
+def _progress(done, total, t0, final=False):
+    elapsed = time.perf_counter() - t0
+    rate = done / elapsed if elapsed > 0 else 0.0
+    of = f"/{total}" if total else ""
+    line = f"\r{done}{of} missions | {elapsed:.1f} s | {rate:,.0f} missions/s"
+    sys.stderr.write(line + ("\n" if final else ""))
+    sys.stderr.flush()
+
+
+def run_sweep(missions, out_path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, total=None, progress=True):
+    """Runs all missions on a process pool, streaming results to `out_path`. Returns stats."""
+    workers = workers or os.cpu_count() or 1
+    sink = open_sink(out_path)
+    done = crashes = errors = 0
+    t0 = last_report = time.perf_counter()
+    try:
+        with multiprocessing.Pool(processes=workers) as pool:
+            for rows in pool.imap(_run_chunk, _chunks(missions, chunk_size)):
+                sink.write(rows)
+                done += len(rows)
+                errors += sum(1 for r in rows if r[2].startswith("ERROR"))
+                crashes += sum(1 for r in rows if r[2] != "OK" and not r[2].startswith("ERROR"))
+                if progress and time.perf_counter() - last_report > PROGRESS_INTERVAL:
+                    last_report = time.perf_counter()
+                    _progress(done, total, t0)
+    finally:
+        sink.close()
+    elapsed = time.perf_counter() - t0
+    if progress:
+        _progress(done, total, t0, final=True)
+    return {"missions": done, "crashes": crashes, "errors": errors, "seconds": elapsed,
+            "missions_per_s": done / elapsed if elapsed > 0 else 0.0, "workers": workers}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a mission matrix through the AeroGuard flight integrator.")
+    parser.add_argument("matrix", help="Mission matrix (.csv, or .json list / grid spec)")
+    parser.add_argument("-o", "--output", default="-", help="Result file (.csv or .parquet), '-' for stdout")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Missions per work unit")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Disable progress output")
+    args = parser.parse_args(argv)
+
+    missions, total = read_missions(args.matrix)
+    stats = run_sweep(missions, args.output, workers=args.workers, chunk_size=args.chunk_size,
+                      total=total, progress=not args.quiet)
+    if not args.quiet:
+        sys.stderr.write(f"{stats['missions']} missions, {stats['crashes']} crashes, {stats['errors']} errors, "
+                         f"{stats['missions_per_s']:,.0f} missions/s on {stats['workers']} workers\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+AeroGuard Flight Telemetry
+--------------------------
+Fixed-capacity, array-backed recorder for per-step flight telemetry.
+
+A `TelemetryBuffer` preallocates one NumPy structured array and writes
+samples into it as a ring: once `capacity` samples are stored, the
+oldest are overwritten, so memory stays bounded however long or finely
+stepped the flight is. A `stride` records only every n-th step;
+`from_result()` picks the stride so that a whole simulated flight fits,
+which keeps replay and scrubbing over the full trajectory.
+
+Each sample holds the position, altitude, speeds, fuel and the margins
+to the envelope rules (positive = inside the envelope). Buffers export
+to CSV, or to Parquet when pyarrow is installed.
+"""
+
+import csv
+import io
+import math
+
+import numpy as np
+
+from aeroguard import physics
+
+DEFAULT_CAPACITY = 10_000
+FIELDS = (
+    ("step", np.int64),
+    ("t", np.float64),  # s
+    ("lat", np.float64),
+    ("lon", np.float64),
+    ("dist", np.float64),  # m flown along the route
+    ("alt", np.float64),  # m
+    ("speed", np.float64),  # m/s true airspeed
+    ("ground_speed", np.float64),  # m/s
+    ("fuel", np.float64),  # kg burned so far
+    ("phase", np.int8),
+    ("stall_margin", np.float64),  # speed - stall speed
+    ("vne_margin", np.float64),  # speed limit - speed
+    ("ceiling_margin", np.float64),  # ceiling - altitude
+    ("low_alt_margin", np.float64),  # low altitude limit - speed (NaN at or above 1000 m)
+)
+DTYPE = np.dtype(list(FIELDS))
+
+
+def envelope_margins(alt, speed, stall_v, ac):
+    """Distance to each envelope rule for every sample; negative means violated."""
+    p = physics.profile_arrays(ac)
+    alt = np.asarray(alt, dtype=float)
+    speed = np.asarray(speed, dtype=float)
+    return {
+        "stall_margin": speed - stall_v,
+        "vne_margin": p["speed_limit"] - speed,
+        "ceiling_margin": p["ceiling"] - alt,
+        "low_alt_margin": np.where(alt < physics.LOW_ALT_THRESHOLD, p["low_alt_limit"] - speed, np.nan),
+    }
+
+
+class TelemetryBuffer:
+    """Ring buffer of telemetry samples with a fixed capacity."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, stride=1):
+        if capacity < 1 or stride < 1:
+            raise ValueError("capacity and stride must be positive")
+        self.capacity = int(capacity)
+        self.stride = int(stride)
+        self._data = np.zeros(self.capacity, dtype=DTYPE)
+        self._head = 0  # next write position
+        self._size = 0
+        self.steps_seen = 0  # steps offered, recorded or not
+        self.dropped = 0  # recorded samples since overwritten by newer ones
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._head = self._size = self.steps_seen = self.dropped = 0
+
+    def extend(self, **columns):
+        """
+        Records a block of consecutive steps given as equally long column
+        arrays (any subset of FIELDS; `step` defaults to the running step
+        count). Only every `stride`-th step is kept and only the newest
+        `capacity` samples survive.
+        """
+        n = len(next(iter(columns.values()))) if columns else 0
+        first = self.steps_seen
+        self.steps_seen += n
+        keep = np.arange((-first) % self.stride, n, self.stride)
+        self.dropped += max(0, self._size + keep.size - self.capacity)
+        if keep.size > self.capacity:
+            keep = keep[-self.capacity:]
+        if not keep.size:
+            return
+
+        columns.setdefault("step", first + np.arange(n))
+        pos = (self._head + np.arange(keep.size)) % self.capacity
+        for name, values in columns.items():
+            self._data[name][pos] = np.asarray(values)[keep]
+        self._head = int(pos[-1] + 1) % self.capacity
+        self._size = min(self._size + keep.size, self.capacity)
+
+    def append(self, **values):
+        """Records a single step."""
+        self.extend(**{k: np.atleast_1d(v) for k, v in values.items()})
+
+    def _order(self):
+        start = (self._head - self._size) % self.capacity
+        return (start + np.arange(self._size)) % self.capacity
+
+    def snapshot(self):
+        """Recorded samples, oldest first, as a structured array copy."""
+        return self._data[self._order()]
+
+    def column(self, name):
+        """One field, oldest first."""
+        return self._data[name][self._order()]
+
+    @property
+    def t(self):
+        return self.column("t")
+
+    def frame(self, i):
+        """Sample `i` in time order (negative counts from the newest) as a dict."""
+        if not -self._size <= i < self._size:
+            raise IndexError("telemetry frame out of range")
+        rec = self._data[(self._head - self._size + i % self._size) % self.capacity]
+        return {name: rec[name].item() for name in DTYPE.names}
+
+    def latest(self):
+        return self.frame(-1) if self._size else None
+
+    # --- EXPORT ---
+    def to_csv(self, target=None):
+        """Writes CSV to a path or text stream; returns the text when `target` is None."""
+        out = io.StringIO() if target is None else target
+        f = open(out, "w", newline="", encoding="utf-8") if isinstance(out, str) else out
+        try:
+            w = csv.writer(f)
+            w.writerow(DTYPE.names)
+            w.writerows(self.snapshot().tolist())
+        finally:
+            if f is not out:
+                f.close()
+        return out.getvalue() if target is None else None
+
+    def to_parquet(self, target=None):
+        """Writes Parquet to a path or binary stream; returns the bytes when `target` is None."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow. Please run: pip install pyarrow") from None
+        snap = self.snapshot()
+        table = pa.table({name: snap[name] for name in DTYPE.names})
+        out = io.BytesIO() if target is None else target
+        pq.write_table(table, out)
+        return out.getvalue() if target is None else None
+
+    # --- CONSTRUCTION ---
+    @classmethod
+    def from_result(cls, result, ac, capacity=DEFAULT_CAPACITY):
+        """
+        Buffer holding a whole FlightResult. Longer flights are thinned to
+        every `stride`-th step so they fit; the last step (arrival or the
+        envelope violation) is always kept.
+        """
+        n = len(result)
+        stride = max(1, math.ceil((n - 1) / (capacity - 1))) if capacity > 1 else max(n, 1)
+        idx = np.arange(0, n, stride)
+        if n and idx[-1] != n - 1:
+            idx = np.append(idx, n - 1)
+
+        margins = envelope_margins(result.alt, result.speed, result.stall_v, ac)
+        buf = cls(capacity=capacity)
+        buf.extend(step=idx, t=result.t[idx], lat=result.lat[idx], lon=result.lon[idx],
+                   dist=result.dist[idx], alt=result.alt[idx], speed=result.speed[idx],
+                   ground_speed=result.ground_speed[idx], fuel=result.fuel[idx],
+                   phase=result.phase[idx], **{k: v[idx] for k, v in margins.items()})
+        buf.stride, buf.steps_seen = stride, n
+        return buf
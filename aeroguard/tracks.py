@@ -0,0 +1,173 @@
+"""
+AeroGuard Track Import & Simplification
+---------------------------------------
+Streaming import of recorded tracks (GPX, CSV / ADS-B exports) into the
+compact (N, 2) float64 (lat, lon) arrays used for routes, plus
+Douglas-Peucker simplification for display at a given map zoom.
+
+Importers never keep per-point Python objects: coordinates are parsed
+one record at a time into a flat `array('d')` buffer and handed to
+NumPy without copying. Simplification is for display only; physics and
+weather keep using the full-resolution track.
+"""
+
+import csv
+import heapq
+import io
+import os
+import xml.etree.ElementTree as ET
+from array import array
+
+import numpy as np
+
+from aeroguard import geo
+
+LAT_COLUMNS = ("lat", "latitude")
+LON_COLUMNS = ("lon", "lng", "long", "longitude")
+GPX_POINT_TAGS = ("trkpt", "rtept")
+TILE_SIZE = 256  # Web Mercator tile size in pixels
+DEFAULT_PIXEL_TOLERANCE = 1.5
+MAX_DISPLAY_POINTS = 5000
+
+
+# --- IMPORT ---
+def _text_stream(source):
+    """Opens a path or wraps a binary file object as text."""
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, newline="", encoding="utf-8-sig")
+    if isinstance(source, io.TextIOBase):
+        return source
+    return io.TextIOWrapper(source, newline="", encoding="utf-8-sig")
+
+
+def _finish(buf):
+    return np.frombuffer(buf, dtype=np.float64).reshape(-1, 2) if buf else np.empty((0, 2))
+
+
+def read_gpx(source):
+    """
+    Streams track / route points from a GPX file into an (N, 2) array.
+    Every element is detached from its parent once parsed, so the tree
+    never holds more than the current path from the root.
+    """
+    buf = array('d')
+    parents = []
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            parents.append(elem)
+            continue
+        parents.pop()
+        if elem.tag.rsplit("}", 1)[-1] in GPX_POINT_TAGS:
+            buf.append(float(elem.get("lat")))
+            buf.append(float(elem.get("lon")))
+        elem.clear()
+        if parents:
+            parents[-1].remove(elem)
+    return _finish(buf)
+
+
+def read_csv(source):
+    """
+    Streams lat/lon columns from a CSV export into an (N, 2) array.
+    Column names are matched case-insensitively (lat/latitude,
+    lon/lng/long/longitude); rows with missing coordinates are skipped.
+    """
+    f = _text_stream(source)
+    try:
+        reader = csv.reader(f)
+        header = [h.strip().lower() for h in next(reader, [])]
+        try:
+            i_lat = next(header.index(c) for c in LAT_COLUMNS if c in header)
+            i_lon = next(header.index(c) for c in LON_COLUMNS if c in header)
+        except StopIteration:
+            raise ValueError("CSV track needs latitude and longitude columns") from None
+
+        buf = array('d')
+        for row in reader:
+            try:
+                lat, lon = float(row[i_lat]), float(row[i_lon])
+            except (IndexError, ValueError):
+                continue
+            buf.append(lat)
+            buf.append(lon)
+    finally:
+        if isinstance(source, (str, os.PathLike)):
+            f.close()
+        elif isinstance(f, io.TextIOWrapper) and f is not source:
+            f.detach()
+    return _finish(buf)
+
+
+def load_track(source, name=None):
+    """Imports a track from a path or file object; format chosen by extension."""
+    name = name or (os.fspath(source) if isinstance(source, (str, os.PathLike)) else getattr(source, "name", ""))
+    if str(name).lower().endswith(".gpx"):
+        track = read_gpx(source)
+    else:
+        track = read_csv(source)
+    if len(track) < 2:
+        raise ValueError("Track needs at least two points")
+    return track
+
+
+# --- SIMPLIFICATION ---
+def douglas_peucker(track, tolerance, max_points=None):
+    """
+    Indices of the points kept by Douglas-Peucker at `tolerance` degrees.
+    Distances are measured in a local equirectangular projection, so
+    longitude is scaled by cos(latitude). Segments are split in order of
+    decreasing error, so with `max_points` the most significant points
+    are kept and the work stops once the budget is reached.
+    """
+    track = geo.as_track(track)
+    n = len(track)
+    if n <= 2 or tolerance <= 0:
+        return np.arange(n)
+
+    y = track[:, 0]
+    x = track[:, 1] * np.cos(np.radians(track[:, 0]))
+
+    def farthest(i, j):
+        dx, dy = x[j] - x[i], y[j] - y[i]
+        px, py = x[i + 1:j] - x[i], y[i + 1:j] - y[i]
+        seg2 = dx * dx + dy * dy
+        if seg2 > 0:
+            t = np.clip((px * dx + py * dy) / seg2, 0.0, 1.0)
+            d2 = (px - t * dx) ** 2 + (py - t * dy) ** 2
+        else:
+            d2 = px * px + py * py
+        k = int(np.argmax(d2))
+        return float(d2[k]), i + 1 + k
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    kept = 2
+    budget = max_points or n
+    tol2 = tolerance * tolerance
+    heap = []
+
+    def push(i, j):
+        if j - i >= 2:
+            d2, k = farthest(i, j)
+            if d2 > tol2:
+                heapq.heappush(heap, (-d2, i, j, k))
+
+    push(0, n - 1)
+    while heap and kept < budget:
+        _, i, j, k = heapq.heappop(heap)
+        keep[k] = True
+        kept += 1
+        push(i, k)
+        push(k, j)
+    return np.flatnonzero(keep)
+
+
+def zoom_tolerance(zoom, pixels=DEFAULT_PIXEL_TOLERANCE):
+    """Tolerance in degrees that corresponds to `pixels` screen pixels at a Web Mercator zoom."""
+    return pixels * 360.0 / (TILE_SIZE * 2.0 ** zoom)
+
+
+def simplify_for_zoom(track, zoom, pixels=DEFAULT_PIXEL_TOLERANCE, max_points=MAX_DISPLAY_POINTS):
+    """Display polyline for a zoom level: Douglas-Peucker capped at `max_points`."""
+    track = geo.as_track(track)
+    return track[douglas_peucker(track, zoom_tolerance(zoom, pixels), max_points=max_points)]
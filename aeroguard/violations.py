@@ -0,0 +1,201 @@
+"""
+AeroGuard Envelope Violation Scan
+---------------------------------
+Audits whole altitude / speed time series against the four envelope
+rules (ceiling, stall, Vne and the below-1000 m low_alt_limit).
+
+For every rule the scan reports the first violating sample (index and
+timestamp) and all violating intervals. Rules are evaluated on their
+own, not in crash priority, so overlapping violations are all listed.
+Each chunk is checked with array operations only, and an
+`EnvelopeScanner` carries open intervals across chunk boundaries, so a
+long recorded flight can be streamed through in fixed-size pieces:
+
+    python -m aeroguard.violations flight.csv --aircraft "Cessna 172 Skyhawk"
+
+The CSV needs altitude and speed columns (alt/altitude, speed/tas/
+velocity); a time column (t/time) is optional.
+"""
+
+import argparse
+import csv
+import json
+import sys
+from array import array
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from aeroguard import physics
+from aeroguard.aircraft import AIRCRAFT_DB
+
+RULES = physics.CRASH_NAMES[1:]  # ALT_HIGH, STALL, STRUCT, ALT_LOW_SPEED
+DEFAULT_CHUNK_SIZE = 100_000
+TIME_COLUMNS = ("t", "time")
+ALT_COLUMNS = ("alt", "altitude")
+SPEED_COLUMNS = ("speed", "tas", "velocity")
+
+
+@dataclass
+class RuleReport:
+    """Violations of one rule. Intervals are (start, stop) sample indices, stop exclusive."""
+    rule: str
+    first_index: int = -1
+    first_time: float = None
+    samples: int = 0
+    intervals: list = field(default_factory=list)
+    interval_times: list = field(default_factory=list)  # (t of first, t of last violating sample)
+
+    @property
+    def violated(self):
+        return self.first_index >= 0
+
+    def to_dict(self):
+        return {"rule": self.rule, "first_index": self.first_index, "first_time": self.first_time,
+                "samples": self.samples, "intervals": [list(iv) for iv in self.intervals],
+                "interval_times": [list(iv) for iv in self.interval_times]}
+
+
+def _runs(mask):
+    """(starts, stops) of the True runs of a 1-D boolean array, stop exclusive."""
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+class EnvelopeScanner:
+    """Incremental envelope audit; feed chunks in time order, then call `report()`."""
+
+    def __init__(self, ac, dt=1.0):
+        self.ac = ac
+        self.dt = dt
+        self.samples = 0
+        self._last_t = None
+        self._reports = {rule: RuleReport(rule) for rule in RULES}
+        self._open = {}  # rule -> (start index, start time) of an interval still running at the chunk end
+
+    def feed(self, alt, speed, t=None):
+        """Scans the next chunk. `t` defaults to a uniform `dt` clock."""
+        alt = np.asarray(alt, dtype=float).ravel()
+        speed = np.asarray(speed, dtype=float).ravel()
+        n = len(alt)
+        if n == 0:
+            return self
+        offset = self.samples
+        t = offset * self.dt + np.arange(n) * self.dt if t is None else np.asarray(t, dtype=float).ravel()
+
+        for rule, mask in zip(RULES, physics.rule_violations(alt, speed, self.ac)):
+            mask = np.broadcast_to(mask, alt.shape)
+            rep = self._reports[rule]
+            starts, stops = _runs(mask)
+            if not starts.size:
+                self._close(rule)
+                continue
+
+            rep.samples += int(np.count_nonzero(mask))
+            if rep.first_index < 0:
+                rep.first_index = offset + int(starts[0])
+                rep.first_time = float(t[starts[0]])
+
+            begin_idx = (offset + starts).tolist()
+            begin_t = t[starts].tolist()
+            # A run starting at 0 continues an interval left open by the previous chunk.
+            if starts[0] == 0 and rule in self._open:
+                begin_idx[0], begin_t[0] = self._open.pop(rule)
+            else:
+                self._close(rule)
+
+            # A run reaching the chunk end stays open until a later chunk ends it.
+            closed = len(starts) - (stops[-1] == n)
+            if closed < len(starts):
+                self._open[rule] = (begin_idx[-1], begin_t[-1])
+            rep.intervals.extend(zip(begin_idx[:closed], (offset + stops[:closed]).tolist()))
+            rep.interval_times.extend(zip(begin_t[:closed], t[stops[:closed] - 1].tolist()))
+
+        self.samples += n
+        self._last_t = float(t[-1])
+        return self
+
+    def _close(self, rule):
+        """Closes an interval left open at the end of the previous chunk."""
+        opened = self._open.pop(rule, None)
+        if opened is not None:
+            rep = self._reports[rule]
+            rep.intervals.append((opened[0], self.samples))
+            rep.interval_times.append((opened[1], self._last_t))
+
+    def report(self):
+        """Per-rule results so far, with intervals still open at the last sample closed there."""
+        out = {}
+        for rule, rep in self._reports.items():
+            out[rule] = RuleReport(rule, rep.first_index, rep.first_time, rep.samples,
+                                   list(rep.intervals), list(rep.interval_times))
+            if rule in self._open:
+                start, t_start = self._open[rule]
+                out[rule].intervals.append((start, self.samples))
+                out[rule].interval_times.append((t_start, self._last_t))
+        return out
+
+    def first_violation(self):
+        """(rule, index, time) of the earliest violation of any rule, or None."""
+        hits = [r for r in self.report().values() if r.violated]
+        if not hits:
+            return None
+        first = min(hits, key=lambda r: (r.first_index, RULES.index(r.rule)))
+        return first.rule, first.first_index, first.first_time
+
+
+def scan(alt, speed, ac, t=None, dt=1.0):
+    """One-shot scan of whole arrays; returns {rule: RuleReport}."""
+    return EnvelopeScanner(ac, dt=dt).feed(alt, speed, t).report()
+
+
+# --- CSV STREAMING ---
+def _column(header, names, required=True):
+    for name in names:
+        if name in header:
+            return header.index(name)
+    if required:
+        raise ValueError(f"Flight log needs one of the columns: {', '.join(names)}")
+    return None
+
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Streams (alt, speed, t or None) array chunks from a CSV flight log."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [h.strip().lower() for h in next(reader, [])]
+        i_alt, i_spd = _column(header, ALT_COLUMNS), _column(header, SPEED_COLUMNS)
+        i_t = _column(header, TIME_COLUMNS, required=False)
+
+        while True:
+            alt, spd, t = array('d'), array('d'), array('d')
+            for row in reader:
+                alt.append(float(row[i_alt]))
+                spd.append(float(row[i_spd]))
+                if i_t is not None:
+                    t.append(float(row[i_t]))
+                if len(alt) >= chunk_size:
+                    break
+            if not alt:
+                return
+            yield (np.frombuffer(alt), np.frombuffer(spd), np.frombuffer(t) if i_t is not None else None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit a recorded flight against the AeroGuard envelope rules.")
+    parser.add_argument("log", help="Flight log CSV with altitude and speed columns")
+    parser.add_argument("-a", "--aircraft", required=True, choices=list(AIRCRAFT_DB), help="Aircraft profile")
+    parser.add_argument("--dt", type=float, default=1.0, help="Sample interval (s) when the log has no time column")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Samples per chunk")
+    args = parser.parse_args(argv)
+
+    scanner = EnvelopeScanner(AIRCRAFT_DB[args.aircraft], dt=args.dt)
+    for alt, speed, t in read_chunks(args.log, args.chunk_size):
+        scanner.feed(alt, speed, t)
+    json.dump({"samples": scanner.samples, "first_violation": scanner.first_violation(),
+               "rules": [r.to_dict() for r in scanner.report().values()]}, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+AeroGuard Weather Client
+------------------------
+Cached access to the Open-Meteo `current_weather` endpoint.
+
+Coordinates are snapped to a configurable grid so nearby clicks share a
+cache entry. Entries live in memory and in a small SQLite store that
+survives restarts; both expire after a TTL. Requests go through a pooled
+`requests.Session` with timeouts, and when the API is unreachable the
+last known (stale) value is returned instead of nothing.
+
+Route sampling fetches many points at once: misses are grouped into
+Open-Meteo multi-coordinate requests, batches run on a bounded thread
+pool, and identical lookups already in flight (e.g. from another user
+session) wait for that request instead of issuing their own.
+
+`requests` is imported when the first upstream call is made, so cache
+lookups and importing this module stay cheap.
+
+Set AEROGUARD_WEATHER_URL to point the client at a local stub server,
+and AEROGUARD_WEATHER_DB to move (or, with ":memory:", disable) the
+on-disk store.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from aeroguard import diagnostics, geo
+
+# --- DEFAULTS ---
+DEFAULT_BASE_URL = "https://api.open-meteo.com/v1/forecast"
+DEFAULT_GRID = 0.1  # degrees, ~11 km in latitude
+DEFAULT_TTL = 600.0  # seconds
+DEFAULT_TIMEOUT = (3.05, 10.0)  # (connect, read) seconds
+DEFAULT_BATCH_SIZE = 50  # coordinates per multi-location request
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MEMORY_ENTRIES = 4096  # grid cells kept in memory; older ones fall back to SQLite
+DEFAULT_WAIT = 30.0  # seconds to wait on a lookup another caller has in flight
+DEFAULT_DB_PATH = os.environ.get(
+    "AEROGUARD_WEATHER_DB", os.path.join(os.path.expanduser("~"), ".cache", "aeroguard", "weather.sqlite"))
+
+
+def quantize(lat, lon, grid=DEFAULT_GRID):
+    """Snaps a coordinate to the cache grid and returns it as a (lat, lon) key."""
+    if grid <= 0:
+        return (round(lat, 6), round(lon, 6))
+    return (round(round(lat / grid) * grid, 6), round(round(lon / grid) * grid, 6))
+
+
+class WeatherCache:
+    """
+    Two-level (memory + SQLite) TTL cache keyed on quantized coordinates.
+    The memory level is an LRU of at most `max_entries` cells.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MEMORY_ENTRIES):
+        self.ttl = ttl
+        self.db_path = db_path
+        self.max_entries = max(1, max_entries)
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            try:
+                if db_path != ":memory:":
+                    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS weather ("
+                    "lat REAL, lon REAL, fetched REAL, payload TEXT, PRIMARY KEY (lat, lon))"
+                )
+                self._db.commit()
+            except (sqlite3.Error, OSError):
+                # Disk store is optional; keep working from memory only.
+                self._db = None
+
+    def get(self, key):
+        """Returns (payload, fetched_at) or None, without checking the TTL."""
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                self._mem.move_to_end(key)
+            elif self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT payload, fetched FROM weather WHERE lat = ? AND lon = ?", key
+                    ).fetchone()
+                except sqlite3.Error:
+                    row = None  # e.g. locked by another process; treat as a miss
+                if row:
+                    entry = (json.loads(row[0]), row[1])
+                    self._remember(key, entry)
+            return entry
+
+    def put(self, key, payload, fetched=None):
+        fetched = time.time() if fetched is None else fetched
+        with self._lock:
+            self._remember(key, (payload, fetched))
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO weather (lat, lon, fetched, payload) VALUES (?, ?, ?, ?)",
+                        (key[0], key[1], fetched, json.dumps(payload)),
+                    )
+                    self._db.commit()
+                except sqlite3.Error:
+                    # e.g. "database is locked" when shared with a sweep; the memory entry still serves.
+                    pass
+
+    def _remember(self, key, entry):
+        """Stores a memory entry as most recently used, evicting the oldest beyond the cap."""
+        self._mem[key] = entry
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def is_fresh(self, entry, now=None):
+        now = time.time() if now is None else now
+        return entry is not None and now - entry[1] < self.ttl
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM weather")
+                self._db.commit()
+
+
+class WeatherClient:
+    """Open-Meteo client with grid-quantized caching, request coalescing and stale fallback."""
+
+    def __init__(self, base_url=None, grid=DEFAULT_GRID, ttl=DEFAULT_TTL,
+                 db_path=DEFAULT_DB_PATH, timeout=DEFAULT_TIMEOUT, session=None,
+                 batch_size=DEFAULT_BATCH_SIZE, max_workers=DEFAULT_MAX_WORKERS, wait=DEFAULT_WAIT,
+                 memory_entries=DEFAULT_MEMORY_ENTRIES):
+        self.base_url = base_url or os.environ.get("AEROGUARD_WEATHER_URL", DEFAULT_BASE_URL)
+        self.grid = grid
+        self.timeout = timeout
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max(1, max_workers)
+        self.wait = wait
+        self.cache = WeatherCache(db_path=db_path, ttl=ttl, max_entries=memory_entries)
+        self._session = session
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "errors": 0, "network_calls": 0, "coalesced": 0}
+        self._stats_lock = threading.Lock()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def session(self):
+        """Pooled HTTP session, created on first use."""
+        if self._session is None:
+            self._session = self._make_session(pool_size=max(16, self.max_workers))
+        return self._session
+
+    @staticmethod
+    def _make_session(pool_size=16):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _count(self, name, n=1):
+        """Adds to the process-wide stats and to the caller's active diagnostics."""
+        with self._stats_lock:
+            self.stats[name] += n
+        diagnostics.count(f"weather.{name}", n)
+
+    def _fetch_many(self, keys):
+        """One upstream call for a list of grid keys. Raises on network or payload errors."""
+        params = {
+            "latitude": ",".join(str(k[0]) for k in keys),
+            "longitude": ",".join(str(k[1]) for k in keys),
+            "current_weather": "true",
+        }
+        r = self.session.get(self.base_url, params=params, timeout=self.timeout)
+        r.raise_for_status()
+        data = r.json()
+        if isinstance(data, dict):
+            data = [data]
+        if len(data) != len(keys):
+            raise ValueError("Unexpected number of locations in weather response")
+        return [rec["current_weather"] for rec in data]
+
+    def _run_batch(self, keys):
+        """
+        Fetches one batch and resolves the in-flight futures of its keys.
+        The futures are always resolved (None on failure), so callers
+        waiting on them never hang, whatever goes wrong here. Returns
+        False when the upstream call failed; batches may run on pool
+        threads, so the caller does the counting.
+        """
+        from requests import RequestException
+
+        payloads = [None] * len(keys)
+        ok = False
+        try:
+            try:
+                payloads = self._fetch_many(keys)
+                ok = True
+            except (RequestException, ValueError, KeyError, TypeError):
+                pass
+            for key, payload in zip(keys, payloads):
+                if payload is not None:
+                    self.cache.put(key, payload)
+        finally:
+            for key, payload in zip(keys, payloads):
+                with self._inflight_lock:
+                    fut = self._inflight.pop(key, None)
+                if fut is not None:
+                    fut.set_result(payload)
+        return ok
+
+    def _pool(self):
+        if self._executor is None:
+            with self._inflight_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix="aeroguard-weather")
+        return self._executor
+
+    def get_many(self, points):
+        """
+        Returns one `current_weather` record (or None) per (lat, lon) in
+        `points`, in order. Fresh cache entries are served directly; the
+        rest are fetched in multi-coordinate batches, concurrently.
+        """
+        keys = [quantize(lat, lon, self.grid) for lat, lon in points]
+        results, stale, need = {}, {}, []
+        for key in dict.fromkeys(keys):
+            entry = self.cache.get(key)
+            if self.cache.is_fresh(entry):
+                self._count("hits")
+                results[key] = entry[0]
+            else:
+                self._count("misses")
+                need.append(key)
+                if entry is not None:
+                    stale[key] = entry[0]
+
+        # Claim keys nobody is fetching yet; wait on the others.
+        owned, waiting = [], {}
+        with self._inflight_lock:
+            for key in need:
+                fut = self._inflight.get(key)
+                if fut is None:
+                    fut = Future()
+                    self._inflight[key] = fut
+                    owned.append(key)
+                waiting[key] = fut
+        self._count("coalesced", len(need) - len(owned))
+
+        batches = [owned[i:i + self.batch_size] for i in range(0, len(owned), self.batch_size)]
+        if len(batches) == 1:
+            done = [self._run_batch(batches[0])]
+        else:
+            done = list(self._pool().map(self._run_batch, batches))
+        self._count("network_calls", len(batches))
+        self._count("errors", done.count(False))
+
+        for key, fut in waiting.items():
+            try:
+                payload = fut.result(timeout=self.wait)
+            except FutureTimeout:
+                self._count("errors")
+                payload = None
+            if payload is None and key in stale:
+                self._count("stale")
+                payload = stale[key]
+            results[key] = payload
+        return [results[k] for k in keys]
+
+    def get(self, lat, lon):
+        """Returns the `current_weather` record for a point, or None if unavailable."""
+        return self.get_many([(lat, lon)])[0]
+
+    def get_route(self, track, n=8):
+        """Samples `n` points evenly spaced along a route track. Returns (points, records)."""
+        points = geo.resample_track(track, n)
+        return points, self.get_many([tuple(p) for p in points])
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        if self._session is not None:
+            self._session.close()
@@ -0,0 +1,112 @@
+"""
+AeroGuard Weather Stub Server
+-----------------------------
+Minimal local stand-in for the Open-Meteo forecast endpoint, for tests,
+benchmarks and offline development.
+
+Answers `current_weather` requests and, when `hourly` variables are
+asked for, synthetic hourly pressure-level series (used to build wind
+fields with `aeroguard.windfield`).
+
+Usage:
+    python -m aeroguard.weather_stub --port 8765
+    AEROGUARD_WEATHER_URL=http://127.0.0.1:8765/v1/forecast streamlit run flight_sim.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def fake_current_weather(lat, lon):
+    """Deterministic, coordinate-dependent weather record."""
+    return {
+        "temperature": round(15.0 - abs(lat) * 0.2, 1),
+        "windspeed": round(10.0 + (abs(lon) % 30), 1),
+        "winddirection": int((lat * 10 + lon * 10) % 360),
+    }
+
+
+STUB_T0 = 1_700_000_000  # unix s of the first hourly value
+
+
+def fake_hourly(lat, lon, variables, hours):
+    """Deterministic hourly pressure-level block (`temperature_850hPa`, `wind_speed_850hPa`, ...)."""
+    hourly = {"time": [STUB_T0 + 3600 * h for h in range(hours)]}
+    for name in variables:
+        var, _, level = name.rpartition("_")
+        p = float(level.removesuffix("hPa"))
+        if var == "temperature":
+            values = [round(15.0 - abs(lat) * 0.2 - (1000 - p) * 0.065 + h * 0.1, 1) for h in range(hours)]
+        elif var == "wind_speed":
+            values = [round(5.0 + (abs(lon) % 10) + (1000 - p) * 0.04 + h * 0.2, 1) for h in range(hours)]
+        else:
+            values = [int((lat * 10 + lon * 10 + h * 5) % 360) for h in range(hours)]
+        hourly[name] = values
+    return hourly
+
+
+class _Handler(BaseHTTPRequestHandler):
+    latency = 0.0
+    calls = 0
+
+    def do_GET(self):
+        type(self).calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        q = parse_qs(urlparse(self.path).query)
+        try:
+            lats = [float(x) for x in q["latitude"][0].split(",")]
+            lons = [float(x) for x in q["longitude"][0].split(",")]
+        except (KeyError, ValueError):
+            self.send_error(400, "latitude and longitude are required")
+            return
+
+        if "hourly" in q:
+            variables = q["hourly"][0].split(",")
+            hours = int(q.get("forecast_hours", ["24"])[0])
+            records = [{"latitude": a, "longitude": b, "hourly": fake_hourly(a, b, variables, hours)}
+                       for a, b in zip(lats, lons)]
+        else:
+            records = [{"latitude": a, "longitude": b, "current_weather": fake_current_weather(a, b)}
+                       for a, b in zip(lats, lons)]
+        body = json.dumps(records if len(records) > 1 else records[0]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start(host="127.0.0.1", port=0, latency=0.0):
+    """Starts the stub in a daemon thread. Returns (server, base_url)."""
+    handler = type("StubHandler", (_Handler,), {"latency": latency, "calls": 0})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}/v1/forecast"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Open-Meteo stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Artificial delay per request (s)")
+    args = parser.parse_args()
+
+    handler = type("StubHandler", (_Handler,), {"latency": args.latency, "calls": 0})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"Serving stub weather on http://{args.host}:{args.port}/v1/forecast")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
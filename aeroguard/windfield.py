@@ -0,0 +1,309 @@
+"""
+AeroGuard Gridded Wind Field
+----------------------------
+Forecast wind and temperature on a lat x lon x pressure level x time
+grid, stored as memory-mapped arrays on disk.
+
+A field is a directory with `meta.json` (axes) and one `.npy` file per
+variable (u / v wind in m/s, temperature in °C), each shaped
+(time, level, lat, lon). Files are opened with `mmap_mode="r"`, so every
+session and batch worker on a host shares the same page-cache copy;
+sampling only touches the pages around the requested points.
+
+`WindField.sample()` interpolates all variables at arbitrary
+(lat, lon, altitude, time) arrays in one vectorized call: linear in
+latitude, longitude and time, and linear in pressure altitude between
+levels (heights from the same exponential atmosphere as the physics
+core). Points outside the grid are clamped to its edges.
+
+Fields are built from Open-Meteo hourly pressure-level data, fetched
+live or read from a saved response:
+
+    python -m aeroguard.windfield ingest wind/ --lat 36:42:0.5 --lon 26:45:0.5 --hours 24
+    AEROGUARD_WIND_FIELD=wind/ streamlit run flight_sim.py
+"""
+
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+
+from aeroguard import geo, physics
+
+DEFAULT_LEVELS = (1000, 925, 850, 700, 600, 500, 400, 300, 250, 200)  # hPa
+DEFAULT_HOURS = 24
+BATCH_SIZE = 50  # coordinates per Open-Meteo request
+VARIABLES = ("u", "v", "temperature")
+META_FILE = "meta.json"
+DTYPE = np.float32
+P_SEA_LEVEL = 1013.25  # hPa
+
+
+def pressure_altitude(p_hpa):
+    """Altitude (m) of a pressure level in the exponential atmosphere of aeroguard.physics."""
+    return -physics.SCALE_HEIGHT * np.log(np.asarray(p_hpa, dtype=float) / P_SEA_LEVEL)
+
+
+def wind_components(speed, direction):
+    """(u, v) in the units of `speed` from a meteorological direction (degrees the wind blows from)."""
+    rad = np.radians(direction)
+    return -speed * np.sin(rad), -speed * np.cos(rad)
+
+
+def _bracket(axis, x):
+    """Lower index and weight of `x` on an ascending axis, clamped to its ends."""
+    n = len(axis)
+    if n == 1:
+        return np.zeros(np.shape(x), dtype=np.intp), np.zeros(np.shape(x))
+    i = np.clip(np.searchsorted(axis, x, side="right") - 1, 0, n - 2)
+    w = np.clip((x - axis[i]) / (axis[i + 1] - axis[i]), 0.0, 1.0)
+    return i, w
+
+
+class WindField:
+    """Memory-mapped (time, level, lat, lon) arrays of u, v and temperature."""
+
+    def __init__(self, path, lats, lons, levels, times, arrays):
+        self.path = path
+        self.lats = np.asarray(lats, dtype=float)
+        self.lons = np.asarray(lons, dtype=float)
+        self.levels = np.asarray(levels, dtype=float)  # hPa, highest pressure (lowest altitude) first
+        self.times = np.asarray(times, dtype=float)  # unix seconds
+        self.heights = pressure_altitude(self.levels)
+        self.arrays = arrays
+
+    @property
+    def shape(self):
+        return (len(self.times), len(self.levels), len(self.lats), len(self.lons))
+
+    # --- STORAGE ---
+    @classmethod
+    def create(cls, path, lats, lons, levels, times):
+        """New field on disk, filled with NaN; the arrays are writable memmaps."""
+        lats, lons = sorted(map(float, lats)), sorted(map(float, lons))
+        levels = sorted(map(float, levels), reverse=True)
+        times = sorted(map(float, times))
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"lats": lats, "lons": lons, "levels": levels, "times": times,
+                       "variables": list(VARIABLES)}, f)
+        shape = (len(times), len(levels), len(lats), len(lons))
+        arrays = {}
+        for name in VARIABLES:
+            arr = np.lib.format.open_memmap(os.path.join(path, f"{name}.npy"), mode="w+", dtype=DTYPE, shape=shape)
+            arr[...] = np.nan
+            arrays[name] = arr
+        return cls(path, lats, lons, levels, times, arrays)
+
+    @classmethod
+    def open(cls, path):
+        """Opens a field read-only; data stays on disk until sampled."""
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in meta["variables"]}
+        return cls(path, meta["lats"], meta["lons"], meta["levels"], meta["times"], arrays)
+
+    def flush(self):
+        for arr in self.arrays.values():
+            if isinstance(arr, np.memmap):
+                arr.flush()
+
+    # --- SAMPLING ---
+    def sample(self, lat, lon, alt, t, variables=VARIABLES):
+        """
+        Interpolated values at points given as broadcastable arrays of
+        latitude / longitude (degrees), altitude (m) and time (unix s).
+        Returns {variable: array}.
+        """
+        lat, lon, alt, t = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (lat, lon, alt, t)))
+        shape = lat.shape
+        # Flat offsets and weights of the 16 surrounding grid nodes, shaped (2, 2, 2, 2, n).
+        flat, weight = np.zeros(1), np.ones(1)
+        for axis, x, n in zip((self.times, self.heights, self.lats, self.lons), (t, alt, lat, lon), self.shape):
+            i, w = _bracket(axis, x.ravel())
+            nodes = np.stack([i, np.minimum(i + 1, n - 1)])
+            flat = flat[..., None, :] * n + nodes
+            weight = weight[..., None, :] * np.stack([1.0 - w, w])
+        flat = flat.astype(np.intp)
+        corners = tuple(range(4))
+        return {name: (weight * self.arrays[name].reshape(-1)[flat]).sum(axis=corners).reshape(shape)
+                for name in variables}
+
+    def uv(self, lat, lon, alt, t):
+        """(u, v) wind in m/s, positive towards east / north."""
+        s = self.sample(lat, lon, alt, t, variables=("u", "v"))
+        return s["u"], s["v"]
+
+    def headwind(self, lat, lon, alt, t, bearing):
+        """Wind component against a course `bearing` (degrees); positive on the nose."""
+        u, v = self.uv(lat, lon, alt, t)
+        rad = np.radians(bearing)
+        return -(u * np.sin(rad) + v * np.cos(rad))
+
+    def wind_from(self, t0):
+        """`wind(lat, lon, alt, t)` callable for `simulate(wind=...)`, with flight time t counted from `t0`."""
+        def wind(lat, lon, alt, t):
+            return self.uv(lat, lon, alt, np.add(t0, t))
+        return wind
+
+    def along_track(self, track, alt, t, n=64):
+        """u, v and temperature at `n` points evenly spaced along a track, at one altitude and time."""
+        pts = geo.resample_track(track, n)
+        return pts, self.sample(pts[:, 0], pts[:, 1], alt, t)
+
+
+@lru_cache(maxsize=8)
+def open_field(path):
+    """Process-wide shared handle to a field directory."""
+    return WindField.open(path)
+
+
+# --- INGESTION ---
+def _hourly_params(levels, hours):
+    names = [f"{var}_{int(p)}hPa" for p in levels for var in ("temperature", "wind_speed", "wind_direction")]
+    return {"hourly": ",".join(names), "wind_speed_unit": "ms", "timeformat": "unixtime",
+            "forecast_hours": hours}
+
+
+def _location_arrays(record, levels):
+    """(times, u, v, temperature) from one location's hourly block; values shaped (time, level)."""
+    hourly = record["hourly"]
+    columns = {k: np.asarray(v, dtype=float) for k, v in hourly.items() if k != "time"}
+    speed = np.column_stack([columns[f"wind_speed_{int(p)}hPa"] for p in levels])
+    direction = np.column_stack([columns[f"wind_direction_{int(p)}hPa"] for p in levels])
+    temperature = np.column_stack([columns[f"temperature_{int(p)}hPa"] for p in levels])
+    u, v = wind_components(speed, direction)
+    return np.asarray(hourly["time"], dtype=float), u, v, temperature
+
+
+def fetch_open_meteo(points, levels=DEFAULT_LEVELS, hours=DEFAULT_HOURS, base_url=None, session=None,
+                     batch_size=BATCH_SIZE):
+    """Yields per-location Open-Meteo records for (lat, lon) points, in order, batching the requests."""
+    from aeroguard.weather import DEFAULT_BASE_URL, DEFAULT_TIMEOUT, WeatherClient
+
+    base_url = base_url or os.environ.get("AEROGUARD_WEATHER_URL", DEFAULT_BASE_URL)
+    session = session or WeatherClient._make_session()
+    params = _hourly_params(levels, hours)
+    for k in range(0, len(points), batch_size):
+        batch = points[k:k + batch_size]
+        r = session.get(base_url, timeout=DEFAULT_TIMEOUT, params={
+            **params,
+            "latitude": ",".join(str(p[0]) for p in batch),
+            "longitude": ",".join(str(p[1]) for p in batch),
+        })
+        r.raise_for_status()
+        data = r.json()
+        data = data if isinstance(data, list) else [data]
+        if len(data) != len(batch):
+            raise ValueError("Unexpected number of locations in forecast response")
+        yield from data
+
+
+def _replace_dir(src, dst):
+    """Moves the finished directory `src` to `dst`, removing any previous `dst`."""
+    old = None
+    if os.path.exists(dst):
+        old = tempfile.mkdtemp(prefix=f".{os.path.basename(dst)}.old.", dir=os.path.dirname(dst))
+        os.replace(dst, os.path.join(old, "field"))
+    try:
+        os.replace(src, dst)
+    except OSError:
+        if old:
+            os.replace(os.path.join(old, "field"), dst)
+        raise
+    if old:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def ingest(path, lats, lons, levels=DEFAULT_LEVELS, records=None, **fetch_kw):
+    """
+    Builds a field at `path` for the lat x lon grid. `records` are
+    per-location Open-Meteo records in row-major (lat, lon) order, e.g.
+    from a saved response; by default they are fetched. Raises
+    ValueError unless there is exactly one record per grid point, all on
+    the same hours and with every value present.
+
+    The field is written to a temporary sibling directory and only
+    replaces an existing one at `path` once it is complete.
+    """
+    lats, lons = sorted(lats), sorted(lons)
+    levels = sorted(levels, reverse=True)
+    points = [(a, b) for a in lats for b in lons]
+    records = iter(records) if records is not None else fetch_open_meteo(points, levels, **fetch_kw)
+
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=f".{os.path.basename(path)}.", dir=os.path.dirname(path))
+    try:
+        field = None
+        count = 0
+        for (i, j), record in zip(itertools.product(range(len(lats)), range(len(lons))), records):
+            count += 1
+            times, u, v, temperature = _location_arrays(record, levels)
+            if field is None:
+                field = WindField.create(tmp, lats, lons, levels, times)
+            elif not np.array_equal(times, field.times):
+                raise ValueError(f"Forecast hours at {points[count - 1]} differ from the first location")
+            if not (np.isfinite(u).all() and np.isfinite(v).all() and np.isfinite(temperature).all()):
+                raise ValueError(f"Missing forecast values at {points[count - 1]}")
+            field.arrays["u"][:, :, i, j] = u
+            field.arrays["v"][:, :, i, j] = v
+            field.arrays["temperature"][:, :, i, j] = temperature
+        if count < len(points) or next(records, None) is not None:
+            raise ValueError(f"Expected {len(points)} forecast locations for a {len(lats)} x {len(lons)} grid, "
+                             f"got {count if count < len(points) else 'more'}")
+        field.flush()
+        _replace_dir(tmp, path)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return WindField.open(path)
+
+
+def _axis(spec):
+    """'start:stop:step' (inclusive) or a comma-separated list of values."""
+    if ":" in spec:
+        start, stop, step = (float(x) for x in spec.split(":"))
+        return np.round(np.arange(start, stop + step / 2, step), 6).tolist()
+    return [float(x) for x in spec.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect a memory-mapped AeroGuard wind field.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ing = sub.add_parser("ingest", help="Fetch (or read) Open-Meteo pressure-level forecasts into a field")
+    ing.add_argument("path", help="Output directory")
+    ing.add_argument("--lat", required=True, help="Latitudes: start:stop:step or a comma-separated list")
+    ing.add_argument("--lon", required=True, help="Longitudes: start:stop:step or a comma-separated list")
+    ing.add_argument("--levels", default=",".join(map(str, DEFAULT_LEVELS)), help="Pressure levels (hPa)")
+    ing.add_argument("--hours", type=int, default=DEFAULT_HOURS, help="Forecast hours to fetch")
+    ing.add_argument("--from-json", metavar="FILE", help="Saved Open-Meteo response instead of fetching")
+    info = sub.add_parser("info", help="Print the axes of a field")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        field = WindField.open(args.path)
+        sys.stdout.write(json.dumps({"shape": field.shape, "lat": [field.lats[0], field.lats[-1]],
+                                     "lon": [field.lons[0], field.lons[-1]], "levels": field.levels.tolist(),
+                                     "time": [field.times[0], field.times[-1]]}) + "\n")
+        return
+
+    records = None
+    if args.from_json:
+        with open(args.from_json, encoding="utf-8") as f:
+            records = json.load(f)
+        records = records if isinstance(records, list) else [records]
+    field = ingest(args.path, _axis(args.lat), _axis(args.lon), _axis(args.levels), records=records,
+                   hours=args.hours)
+    sys.stderr.write(f"Wrote {args.path}: {' x '.join(map(str, field.shape))} (time x level x lat x lon)\n")
+
+
+if __name__ == "__main__":
+    main()
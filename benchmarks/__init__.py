@@ -0,0 +1,6 @@
+"""
+AeroGuard Benchmarks
+--------------------
+Timing suite for the physics core, chart and map rendering, the weather
+client and full Streamlit reruns. See `python -m benchmarks.run --help`.
+"""
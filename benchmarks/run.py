@@ -0,0 +1,286 @@
+"""
+AeroGuard Benchmark Runner
+--------------------------
+Times the hot paths of the app and stores the results as JSON so runs
+can be compared against a saved baseline.
+
+Usage:
+    python -m benchmarks.run --save benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.25
+    python -m benchmarks.run --only physics,weather
+
+A benchmark regresses when its median time exceeds the baseline median
+by more than the threshold; the runner then exits with status 1.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "flight_sim.py")
+ROUTE = np.array([(41.0, 29.0), (40.5, 31.0), (39.9, 32.8)])
+LONG_ROUTE = np.array([(41.0, 22.0), (34.0, 45.0)])  # About 11 h for the Cessna
+BOEING = "Boeing 737-800"
+CESSNA = "Cessna 172 Skyhawk"
+
+BENCHMARKS = {}
+
+
+def benchmark(group, repeat=7):
+    """Registers `fn(setup_result) -> callable`; the returned callable is what gets timed."""
+    def wrap(fn):
+        BENCHMARKS[fn.__name__] = {"group": group, "repeat": repeat, "setup": fn}
+        return fn
+    return wrap
+
+
+# --- STARTUP ---
+def _cold_process(*modules):
+    """Fresh interpreter that imports `modules`, as a batch worker or new container would."""
+    cmd = [sys.executable, "-c", "import " + ", ".join(modules)]
+    return lambda: subprocess.run(cmd, cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL,
+                                  stderr=subprocess.DEVNULL)
+
+
+@benchmark("startup", repeat=5)
+def import_core():
+    return _cold_process("aeroguard.simulation", "aeroguard.sweep", "aeroguard.weather", "aeroguard.charts",
+                         "aeroguard.mapview", "aeroguard.tracks")
+
+
+@benchmark("startup", repeat=5)
+def import_ui():
+    return _cold_process("streamlit", "streamlit_folium", "matplotlib.figure")
+
+
+# --- PHYSICS ---
+@benchmark("physics")
+def envelope_check_1m():
+    from aeroguard import physics
+    from aeroguard.aircraft import AIRCRAFT_DB
+    rng = np.random.default_rng(0)
+    alt = rng.uniform(0, 16000, 1_000_000)
+    vel = rng.uniform(0, 700, 1_000_000)
+    ac = AIRCRAFT_DB[BOEING]
+    return lambda: physics.check_envelope(alt, vel, ac)
+
+
+@benchmark("physics")
+def envelope_curve_uncached():
+    from aeroguard import charts
+    return lambda: charts.envelope_curve.__wrapped__(70000, 124.6)
+
+
+@benchmark("physics")
+def safety_map_uncached():
+    from aeroguard import safety_map
+    from aeroguard.aircraft import AIRCRAFT_DB
+    key = safety_map.envelope_key(AIRCRAFT_DB[BOEING])
+    return lambda: safety_map._cached_map.__wrapped__(key, safety_map.ALT_RANGE, safety_map.SPEED_RANGE,
+                                                      safety_map.BASE_CELLS, safety_map.MAX_LEVEL)
+
+
+@benchmark("physics")
+def flight_integration():
+    from aeroguard.aircraft import AIRCRAFT_DB
+    from aeroguard.simulation import simulate
+    return lambda: simulate(ROUTE, AIRCRAFT_DB[BOEING], 8000, 220, headwind=5.0)
+
+
+@benchmark("physics", repeat=5)
+def wind_field_flight():
+    from aeroguard import windfield
+    from aeroguard.aircraft import AIRCRAFT_DB
+    from aeroguard.simulation import simulate
+    path = os.path.join(tempfile.mkdtemp(), "wind")
+    windfield.ingest(path, np.arange(33.0, 43.0), np.arange(21.0, 47.0), base_url=_stub(), hours=12)
+    field = windfield.WindField.open(path)
+    wind = field.wind_from(field.times[0])
+    return lambda: simulate(LONG_ROUTE, AIRCRAFT_DB[CESSNA], 2500, 55, wind=wind)
+
+
+# --- RENDERING ---
+@benchmark("rendering")
+def folium_map_build():
+    import folium  # noqa: F401  (import cost is not part of the timing)
+    from aeroguard import mapview
+
+    def run():
+        m = mapview.make_base_map()
+        mapview.route_layer(ROUTE, "plane.png").add_to(m)
+        m.get_root().render()
+    return run
+
+
+@benchmark("rendering")
+def envelope_figure_render():
+    from aeroguard import charts
+
+    def run():
+        charts.envelope_background.cache_clear()
+        charts.envelope_background(70000, 124.6, "Altitude (m)", "Speed (m/s)")
+    return run
+
+
+@benchmark("rendering")
+def envelope_overlay():
+    from aeroguard import charts
+    charts.envelope_background(70000, 124.6, "Altitude (m)", "Speed (m/s)")
+    return lambda: charts.envelope_image(70000, 124.6, 8000, 220, 120.0, "Altitude (m)", "Speed (m/s)")
+
+
+# --- WEATHER ---
+def _stub():
+    from aeroguard import weather_stub
+    if not hasattr(_stub, "url"):
+        _stub.server, _stub.url = weather_stub.start(latency=0.005)
+    return _stub.url
+
+
+@benchmark("weather")
+def weather_route_cold():
+    from aeroguard.weather import WeatherClient
+    url = _stub()
+
+    def run():
+        client = WeatherClient(base_url=url, db_path=None)
+        client.get_route(ROUTE, n=8)
+        client.close()
+    return run
+
+
+@benchmark("weather")
+def weather_route_warm():
+    from aeroguard.weather import WeatherClient
+    client = WeatherClient(base_url=_stub(), db_path=None)
+    client.get_route(ROUTE, n=8)
+    return lambda: client.get_route(ROUTE, n=8)
+
+
+# --- END TO END ---
+def _app_test():
+    from streamlit.testing.v1 import AppTest
+    os.environ["AEROGUARD_WEATHER_URL"] = _stub()
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.session_state["route"] = ROUTE.copy()
+    return at
+
+
+@benchmark("e2e", repeat=3)
+def app_first_run():
+    def run():
+        _app_test().run()
+    return run
+
+
+@benchmark("e2e", repeat=5)
+def app_rerun():
+    at = _app_test()
+    at.run()
+    return at.run
+
+
+# --- HARNESS ---
+def time_benchmark(name, spec, min_time=0.05):
+    """Runs one benchmark; each sample loops until `min_time` has elapsed."""
+    fn = spec["setup"]()
+    fn()  # Warm-up
+    samples = []
+    for _ in range(spec["repeat"]):
+        loops, t0 = 0, time.perf_counter()
+        while True:
+            fn()
+            loops += 1
+            elapsed = time.perf_counter() - t0
+            if elapsed >= min_time:
+                break
+        samples.append(elapsed / loops)
+    return {"group": spec["group"], "median": statistics.median(samples), "min": min(samples),
+            "repeat": len(samples)}
+
+
+def environment():
+    import matplotlib
+    import streamlit
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(), "platform": platform.platform(),
+        "numpy": np.__version__, "matplotlib": matplotlib.__version__, "streamlit": streamlit.__version__,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Returns rows of (name, baseline, current, ratio, regressed)."""
+    rows = []
+    for name, cur in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            rows.append((name, None, cur["median"], None, False))
+            continue
+        ratio = cur["median"] / base["median"] if base["median"] else float("inf")
+        rows.append((name, base["median"], cur["median"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def _fmt(seconds):
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the AeroGuard benchmark suite.")
+    parser.add_argument("--only", help="Comma-separated groups or benchmark names")
+    parser.add_argument("--save", metavar="PATH", help="Write results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown before flagging a regression (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    wanted = set(args.only.split(",")) if args.only else None
+    os.environ.setdefault("AEROGUARD_WEATHER_DB", os.path.join(tempfile.mkdtemp(), "weather.sqlite"))
+    sys.path.insert(0, REPO_ROOT)
+
+    results = {}
+    for name, spec in BENCHMARKS.items():
+        if wanted and name not in wanted and spec["group"] not in wanted:
+            continue
+        results[name] = time_benchmark(name, spec)
+        print(f"{spec['group']:<10} {name:<26} {_fmt(results[name]['median']):>10}", file=sys.stderr)
+
+    report = {"environment": environment(), "results": results}
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    regressions = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\n{'benchmark':<26} {'baseline':>10} {'current':>10} {'ratio':>7}")
+        for name, base, cur, ratio, regressed in compare(results, baseline, args.threshold):
+            flag = "  REGRESSION" if regressed else ""
+            r = f"{ratio:.2f}" if ratio is not None else "new"
+            print(f"{name:<26} {_fmt(base):>10} {_fmt(cur):>10} {r:>7}{flag}")
+            regressions += regressed
+        if regressions:
+            print(f"\n{regressions} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,20 +18,18 @@ License: MIT
 
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-import folium
-from streamlit_folium import st_folium
-import requests
+import importlib.util
 import os
-import base64
 import time
+import uuid
 
-# --- LIBRARY DEPENDENCY CHECK ---
-try:
-    from geopy.distance import geodesic
-except ImportError:
-    st.error("Missing dependencies. Please run: pip install geopy requests")
-    st.stop()
+from aeroguard import charts, geo, mapview, physics, safety_map, tracks, windfield
+from aeroguard.aircraft import AIRCRAFT_DB, CUSTOM
+from aeroguard.diagnostics import Diagnostics, timing_log_target
+from aeroguard.i18n import TRANSLATIONS
+from aeroguard.simulation import simulate, playback
+from aeroguard.telemetry import TelemetryBuffer
+from aeroguard.weather import WeatherClient
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(page_title="AeroGuard Pro", layout="wide")
@@ -62,188 +60,43 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# --- INTERNATIONALIZATION (I18N) DICTIONARY ---
-TRANSLATIONS = {
-    "TR": {
-        "tabs": ["🗺️ Rota Planlama", "✈️ Teknik Özellikler", "📊 Mühendislik Analizi", "🚀 Simülasyon"],
-        "cockpit": "Kokpit Paneli", "aircraft": "Uçak Seçimi",
-        "params": "Uçuş Parametreleri", "alt": "İrtifa (m)", "spd": "Hız (m/s)",
-        "specs_title": "Teknik Veri Kartı", "mass": "Kütle", "span": "Kanat Açıklığı", "len": "Uzunluk", "eng": "Motor",
-        "env_title": "Uçuş Zarfı Analizi",
-        "env_desc": "Güvenli uçuş sınırlarını gösterir. Çizginin altı Stall bölgesidir.",
-        "wind_title": "Kalkış Performansı",
-        "wind_desc": "Rüzgar yönünün kalkış hızına etkisi. Karşı rüzgar avantaj sağlar.",
-        "start": "UÇUŞU BAŞLAT", "reset": "Rotayı Temizle",
-        "no_route": "⚠️ Rota oluşturulmadı! Lütfen harita sekmesinden 2 nokta seçiniz.",
-        "click_map": "Başlangıç ve Bitiş noktalarını belirlemek için haritaya tıklayın.",
-        "waiting_data": "Veri bekleniyor...", "weather_title": "Atmosferik Veriler",
-        "sim_running": "Simülasyon Yürütülüyor...", "sim_done": "Operasyon Başarıyla Tamamlandı",
-        "crash_alt_high": "🚨 KRİTİK HATA: İrtifa Limiti Aşıldı (Motorlar Durdu)!",
-        "crash_alt_low": "🚨 KRİTİK HATA: Aşırı Alçak İrtifada Yüksek Hız (Yapısal Hasar)!",
-        "crash_stall": "🚨 KRİTİK HATA: Stall Hızı! (Tutunma Kaybı)",
-        "crash_struct": "🚨 KRİTİK HATA: Yapısal Hız Limiti Aşıldı! (Gövde Parçalandı)",
-        "sim_failed": "OPERASYON BAŞARISIZ"
-    },
-    "EN": {
-        "tabs": ["🗺️ Route Planning", "✈️ Tech Specs", "📊 Engineering Analysis", "🚀 Simulation"],
-        "cockpit": "Cockpit Panel", "aircraft": "Select Aircraft",
-        "params": "Flight Parameters", "alt": "Altitude (m)", "spd": "Speed (m/s)",
-        "specs_title": "Technical Data Sheet", "mass": "Mass", "span": "Wingspan", "len": "Length", "eng": "Engine",
-        "env_title": "Flight Envelope", "env_desc": "Shows safe flight limits. Below line is Stall zone.",
-        "wind_title": "Takeoff Performance", "wind_desc": "Effect of wind on takeoff speed. Headwind is advantageous.",
-        "start": "START FLIGHT", "reset": "Clear Route",
-        "no_route": "⚠️ No route created! Please select 2 points on the map tab.",
-        "click_map": "Click on the map to set Start and End points.",
-        "waiting_data": "Waiting for data...", "weather_title": "Atmospheric Data",
-        "sim_running": "Simulation Running...", "sim_done": "Operation Complete",
-        "crash_alt_high": "🚨 CRITICAL ERROR: Ceiling Exceeded (Flameout)!",
-        "crash_alt_low": "🚨 CRITICAL ERROR: Low Altitude Overspeed (Structural Failure)!",
-        "crash_stall": "🚨 CRITICAL ERROR: Stall Speed (Lift Lost)!",
-        "crash_struct": "🚨 CRITICAL ERROR: Vne Exceeded (Airframe Damage)!",
-        "sim_failed": "OPERATION FAILED"
-    },
-    "DE": {
-        "tabs": ["🗺️ Routenplanung", "✈️ Technische Daten", "📊 Analyse", "🚀 Simulation"],
-        "cockpit": "Cockpit-Panel", "aircraft": "Flugzeugwahl",
-        "params": "Flugparameter", "alt": "Höhe (m)", "spd": "Geschw. (m/s)",
-        "specs_title": "Datenblatt", "mass": "Masse", "span": "Spannweite", "len": "Länge", "eng": "Motor",
-        "env_title": "Flugbereich", "env_desc": "Zeigt sichere Grenzen. Unter der Linie ist Stall-Bereich.",
-        "wind_title": "Startleistung", "wind_desc": "Windeinfluss auf Startgeschw. Gegenwind ist vorteilhaft.",
-        "start": "STARTEN", "reset": "Route Löschen",
-        "no_route": "⚠️ Keine Route! Bitte wählen Sie 2 Punkte auf der Karte.",
-        "click_map": "Klicken Sie auf die Karte, um Start und Ziel festzulegen.",
-        "waiting_data": "Warte auf Daten...", "weather_title": "Atmosphärische Daten",
-        "sim_running": "Simulation läuft...", "sim_done": "Operation Abgeschlossen",
-        "crash_alt_high": "🚨 KRITISCHER FEHLER: Dienstgipfelhöhe überschritten!",
-        "crash_alt_low": "🚨 KRITISCHER FEHLER: Zu schnell in Bodennähe!",
-        "crash_stall": "🚨 KRITISCHER FEHLER: Strömungsabriss (Stall)!",
-        "crash_struct": "🚨 KRITISCHER FEHLER: Geschwindigkeitslimit überschritten!",
-        "sim_failed": "OPERATION FEHLGESCHLAGEN"
-    },
-    "FR": {
-        "tabs": ["🗺️ Planification", "✈️ Spécifications", "📊 Analyse", "🚀 Simulation"],
-        "cockpit": "Panneau Cockpit", "aircraft": "Choix Avion",
-        "params": "Paramètres", "alt": "Altitude (m)", "spd": "Vitesse (m/s)",
-        "specs_title": "Fiche Technique", "mass": "Masse", "span": "Envergure", "len": "Longueur", "eng": "Moteur",
-        "env_title": "Domaine de Vol", "env_desc": "Limites de sécurité. Zone de décrochage sous la ligne.",
-        "wind_title": "Performance Décollage", "wind_desc": "Effet du vent. Le vent de face est avantageux.",
-        "start": "DÉMARRER", "reset": "Effacer",
-        "no_route": "⚠️ Pas de route! Sélectionnez 2 points sur la carte.",
-        "click_map": "Cliquez sur la carte pour définir le départ et l'arrivée.",
-        "waiting_data": "En attente...", "weather_title": "Données Atmosphériques",
-        "sim_running": "Simulation en cours...", "sim_done": "Opération Terminée",
-        "crash_alt_high": "🚨 ERREUR CRITIQUE: Plafond dépassé!",
-        "crash_alt_low": "🚨 ERREUR CRITIQUE: Survitesse à basse altitude!",
-        "crash_stall": "🚨 ERREUR CRITIQUE: Décrochage!",
-        "crash_struct": "🚨 ERREUR CRITIQUE: Vitesse structurelle dépassée!",
-        "sim_failed": "ÉCHEC DE L'OPÉRATION"
-    },
-    "RU": {
-        "tabs": ["🗺️ Маршрут", "✈️ Характеристики", "📊 Анализ", "🚀 Симуляция"],
-        "cockpit": "Панель Кабины", "aircraft": "Выбор Самолета",
-        "params": "Параметры", "alt": "Высота (м)", "spd": "Скорость (м/с)",
-        "specs_title": "Тех. Паспорт", "mass": "Масса", "span": "Размах", "len": "Длина", "eng": "Двигатель",
-        "env_title": "Огибающая Полета", "env_desc": "Безопасные границы. Ниже линии - сваливание.",
-        "wind_title": "Взлетные Хар-ки", "wind_desc": "Влияние ветра. Встречный ветер выгоден.",
-        "start": "СТАРТ", "reset": "Сброс",
-        "no_route": "⚠️ Нет маршрута! Выберите 2 точки на карте.",
-        "click_map": "Нажмите на карту для выбора точек.",
-        "waiting_data": "Ожидание данных...", "weather_title": "Атмосферные Данные",
-        "sim_running": "Симуляция запущена...", "sim_done": "Операция Завершена",
-        "crash_alt_high": "🚨 КРИТИЧЕСКАЯ ОШИБКА: Превышен потолок!",
-        "crash_alt_low": "🚨 КРИТИЧЕСКАЯ ОШИБКА: Превышение скорости у земли!",
-        "crash_stall": "🚨 КРИТИЧЕСКАЯ ОШИБКА: Сваливание!",
-        "crash_struct": "🚨 КРИТИЧЕСКАЯ ОШИБКА: Разрушение конструкции!",
-        "sim_failed": "ОПЕРАЦИЯ ПРОВАЛЕНА"
-    },
-    "JP": {
-        "tabs": ["🗺️ ルート計画", "✈️ 機体仕様", "📊 分析", "🚀 シミュレーション"],
-        "cockpit": "コックピット", "aircraft": "機体選択",
-        "params": "飛行パラメータ", "alt": "高度 (m)", "spd": "速度 (m/s)",
-        "specs_title": "技術データ", "mass": "質量", "span": "翼幅", "len": "全長", "eng": "エンジン",
-        "env_title": "飛行包絡線", "env_desc": "安全限界を示します。線の下は失速領域です。",
-        "wind_title": "離陸性能", "wind_desc": "風の影響。向かい風は離陸に有利です。",
-        "start": "開始", "reset": "リセット",
-        "no_route": "⚠️ ルートがありません！地図上で2点を選択してください。",
-        "click_map": "地図をクリックして始点と終点を設定してください。",
-        "waiting_data": "データ待機中...", "weather_title": "気象データ",
-        "sim_running": "シミュレーション実行中...", "sim_done": "作戦完了",
-        "crash_alt_high": "🚨 致命的エラー: 上昇限度超過!",
-        "crash_alt_low": "🚨 致命的エラー: 低高度での速度超過!",
-        "crash_stall": "🚨 致命的エラー: 失速 (ストール)!",
-        "crash_struct": "🚨 致命的エラー: 構造限界速度超過!",
-        "sim_failed": "作戦失敗"
-    }
-}
-
-# --- AIRCRAFT DATABASE ---
-AIRCRAFT_DB = {
-    "Boeing 737-800": {
-        "mass": 70000, "area": 124.6, "ceiling": 12500, "fuel_rate": 2.8, "speed_limit": 260,
-        "low_alt_limit": 170,  # Max safe speed below 1000m
-        "img": "b737.jpg", "icon": "plane.png",
-        "length": "39.5 m", "span": "35.8 m", "engine": "2x CFM56-7B Turbofan",
-        "desc": {
-            "TR": "Dünyanın en popüler yolcu uçağı.", "EN": "World's most popular airliner.",
-            "DE": "Beliebtestes Verkehrsflugzeug.", "FR": "L'avion de ligne le plus populaire.",
-            "RU": "Самый популярный авиалайнер.", "JP": "世界で最も人気のある旅客機。"
-        }
-    },
-    "F-16 Fighting Falcon": {
-        "mass": 12000, "area": 27.8, "ceiling": 15000, "fuel_rate": 4.5, "speed_limit": 600,
-        "low_alt_limit": 400,
-        "img": "f16.jpg", "icon": "jet.png",
-        "length": "15.06 m", "span": "9.96 m", "engine": "1x GE F110",
-        "desc": {
-            "TR": "Yüksek manevra kabiliyetli savaş jeti.", "EN": "High maneuverability fighter jet.",
-            "DE": "Hochmanövrierfähiger Kampfjet.", "FR": "Avion de chasse très maniable.",
-            "RU": "Высокоманевренный истребитель.", "JP": "高機動戦闘機。"
-        }
-    },
-    "Cessna 172 Skyhawk": {
-        "mass": 1100, "area": 16.2, "ceiling": 4100, "fuel_rate": 0.3, "speed_limit": 80,
-        "low_alt_limit": 65,
-        "img": "cessna.jpg", "icon": "cessna.png",
-        "length": "8.28 m", "span": "11.00 m", "engine": "1x Lycoming IO-360",
-        "desc": {
-            "TR": "Eğitim uçağı.", "EN": "Training aircraft.",
-            "DE": "Schulflugzeug.", "FR": "Avion d'entraînement.",
-            "RU": "Учебно-тренировочный самолет.", "JP": "練習機。"
-        }
-    },
-    "Custom / Manuel": {
-        "mass": 5000, "area": 30.0, "ceiling": 10000, "fuel_rate": 1.5, "speed_limit": 300,
-        "low_alt_limit": 200,
-        "img": "custom.jpg", "icon": "custom.png",
-        "length": "N/A", "span": "N/A", "engine": "Prototype",
-        "desc": {
-            "TR": "Deneysel.", "EN": "Experimental.",
-            "DE": "Experimentell.", "FR": "Expérimental.",
-            "RU": "Экспериментальный.", "JP": "実験的。"
-        }
-    }
-}
+ROUTE_WEATHER_SAMPLES = 8  # Points sampled along the route for route weather
+SIM_PLAYBACK_SECONDS = 2.0  # Wall-clock length of the simulation replay
+SIM_FPS = 15  # Max UI updates per second during the replay
+DEPARTURE_COURSE_M = 5000.0  # Route distance over which the departure course is taken
 
 
 # --- HELPER FUNCTIONS ---
-def image_to_base64(img_path):
-    """Converts a local image to Base64 for embedding in Folium maps."""
-    try:
-        with open(img_path, "rb") as f:
-            return base64.b64encode(f.read()).decode('utf-8')
-    except:
-        return None
+@st.cache_resource
+def get_weather_client():
+    """Shared, process-wide weather client (pooled session + grid cache)."""
+    return WeatherClient()
 
 
 def get_real_weather(lat, lon):
-    """Fetches real-time weather data from Open-Meteo API."""
-    try:
-        url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
-        r = requests.get(url).json()
-        return r['current_weather']
-    except:
-        return None
+    """Fetches real-time weather data from Open-Meteo API (cached, stale on failure)."""
+    return get_weather_client().get(lat, lon)
+
+
+def departure_course(route):
+    """Course (degrees) from the first point towards the route DEPARTURE_COURSE_M further on."""
+    cum_dist = geo.cumulative_distance(route)
+    lat, lon = geo.positions_along(route, cum_dist, min(DEPARTURE_COURSE_M, cum_dist[-1]))[0]
+    return float(geo.initial_bearing(*route[0], lat, lon))
+
 
+@st.cache_resource
+def get_wind_field():
+    """Memory-mapped forecast field named by AEROGUARD_WIND_FIELD, shared by all sessions (None if unset)."""
+    path = os.environ.get("AEROGUARD_WIND_FIELD")
+    return windfield.open_field(path) if path else None
+
+
+# --- RERUN DIAGNOSTICS ---
+# Read the sidebar toggle from the previous run so timing starts here
+if 'session_id' not in st.session_state: st.session_state.session_id = uuid.uuid4().hex[:8]
+diag = Diagnostics(enabled=bool(st.session_state.get('diagnostics')) or timing_log_target() is not None,
+                   session=st.session_state.session_id)
 
 # --- SIDEBAR CONFIGURATION ---
 st.sidebar.header("🌐 Language / Dil")
@@ -256,68 +109,79 @@ st.sidebar.header(f"✈ {T['cockpit']}")
 model = st.sidebar.selectbox(T['aircraft'], list(AIRCRAFT_DB.keys()))
 ac = AIRCRAFT_DB[model]
 
-# Manual Input Logic
-if model == "Custom / Manuel":
-    ac["mass"] = st.sidebar.number_input(T['mass'], value=5000)
-    ac["area"] = st.sidebar.number_input(T['area'], value=30.0)
-    ac["ceiling"] = st.sidebar.number_input("Max Alt (m)", value=10000)
-
-st.sidebar.subheader(T['params'])
-target_alt = st.sidebar.slider(T['alt'], 0, 16000, 8000)
-velocity = st.sidebar.number_input(T['spd'], value=220)
-
-# Global Physics Calculations
-rho = 1.225 * np.exp(-target_alt / 8500)
-area_c = ac["area"] if ac["area"] > 0 else 1.0
-stall_v = np.sqrt((2 * ac["mass"] * 9.81) / (rho * area_c * 1.6))
+# Manual Input Logic (a per-session overlay; the shared table is read-only)
+if model == CUSTOM:
+    ac = ac.with_overrides(mass=st.sidebar.number_input(T['mass'], value=5000),
+                           area=st.sidebar.number_input(T['area'], value=30.0),
+                           ceiling=st.sidebar.number_input("Max Alt (m)", value=10000))
 
 # --- MAIN APPLICATION ---
 st.title("AEROGUARD PRO")
 
 # Initialize Session State
-if 'route' not in st.session_state: st.session_state.route = []
+if 'route' not in st.session_state: st.session_state.route = np.empty((0, 2))
 
 # Tabs Layout
 tab1, tab2, tab3, tab4 = st.tabs(T['tabs'])
 
-# --- TAB 1: ROUTE PLANNING ---
-with tab1:
-    col_map, col_weather = st.columns([3, 1])
-    with col_map:
-        m = folium.Map(location=[39.0, 35.0], zoom_start=5, tiles="OpenStreetMap")
-
-        # Draw Existing Markers
-        if len(st.session_state.route) > 0:
-            folium.Marker(st.session_state.route[0], icon=folium.Icon(color="green", icon="play")).add_to(m)
-        if len(st.session_state.route) == 2:
-            folium.Marker(st.session_state.route[1], icon=folium.Icon(color="red", icon="flag")).add_to(m)
-            folium.PolyLine(st.session_state.route, color="blue", weight=4).add_to(m)
 
-            # Custom Aircraft Icon
-            b64 = image_to_base64(os.path.join("images", ac["icon"]))
-            if b64:
-                icon_obj = folium.CustomIcon(f"data:image/png;base64,{b64}", icon_size=(45, 45))
-                folium.Marker(st.session_state.route[0], icon=icon_obj).add_to(m)
-
-        # Map Click Interaction
-        map_data = st_folium(m, height=500, width="100%", key="main_map")
+# --- PAGE SECTIONS ---
+# Every section is a fragment with explicit inputs, so an interaction only
+# reruns the sections that depend on it:
+#   route_section      <- aircraft icon        (map click / zoom / import)
+#   weather_section    <- route
+#   specs_section      <- aircraft, language
+#   analysis_section   <- aircraft             (altitude / speed in the sidebar)
+#   simulation_section <- route, aircraft, altitude, speed   (START)
+# Language and aircraft changes rerun the whole app; route edits do too,
+# because weather and simulation depend on the route.
+
+@st.fragment
+def route_section(T, icon):
+    from streamlit_folium import st_folium
+
+    with diag.fragment("route") as d:
+        # Stable base map per session; markers, route and icon are sent as a dynamic layer
+        with d.span("map_build"):
+            if 'base_map' not in st.session_state:
+                st.session_state.base_map = mapview.make_base_map()
+            zoom = (st.session_state.get("main_map") or {}).get("zoom") or mapview.BASE_ZOOM
+            route_fg = mapview.route_layer(st.session_state.route, icon, zoom)
+
+        # Map Click Interaction (zoom / pan only rerun this fragment)
+        with d.span("st_folium"):
+            map_data = st_folium(st.session_state.base_map, height=500, width="100%", key="main_map",
+                                 feature_group_to_add=route_fg, returned_objects=["last_clicked", "zoom"])
 
         if map_data and map_data['last_clicked']:
             pt = (map_data['last_clicked']['lat'], map_data['last_clicked']['lng'])
-            if len(st.session_state.route) < 2:
-                # Prevent double-click adding same point
-                if not st.session_state.route or st.session_state.route[-1] != pt:
-                    st.session_state.route.append(pt)
-                    st.rerun()
+            # st_folium keeps returning the last click on later reruns; only add new clicks
+            if pt != st.session_state.get('last_click'):
+                st.session_state.last_click = pt
+                st.session_state.route = np.vstack([st.session_state.route, pt])
+                st.rerun()
+
+        # Track Import (full resolution is kept; the map shows a simplified line)
+        upload = st.file_uploader(T['import_track'], type=["gpx", "csv"])
+        if upload is not None and upload.file_id != st.session_state.get('track_file'):
+            st.session_state.track_file = upload.file_id
+            try:
+                st.session_state.route = tracks.load_track(upload, upload.name)
+                st.rerun()
+            except (ValueError, KeyError, TypeError, SyntaxError) as e:
+                st.error(str(e))
 
         if st.button(T['reset']):
-            st.session_state.route = []
+            st.session_state.route = np.empty((0, 2))
             st.rerun()
 
-    with col_weather:
+
+@st.fragment
+def weather_section(T, route):
+    with diag.fragment("weather") as d, d.span("weather"):
         st.subheader(T['weather_title'])
-        if len(st.session_state.route) > 0:
-            last_pt = st.session_state.route[-1]
+        if len(route) > 0:
+            last_pt = route[-1]
             w = get_real_weather(last_pt[0], last_pt[1])
             if w:
                 st.markdown(f"""
@@ -329,11 +193,24 @@ with tab1:
                 """, unsafe_allow_html=True)
             else:
                 st.warning("Service Unavailable")
+
+            if len(route) >= 2:
+                st.subheader(T['route_weather'])
+                pts, recs = get_weather_client().get_route(route, n=ROUTE_WEATHER_SAMPLES)
+                rows = [{"Lat": round(p[0], 2), "Lon": round(p[1], 2),
+                         "°C": r['temperature'] if r else None,
+                         "km/h": r['windspeed'] if r else None,
+                         "Dir °": r['winddirection'] if r else None} for p, r in zip(pts, recs)]
+                st.dataframe(rows, hide_index=True)
+
+            ws = get_weather_client().stats
+            st.caption(f"Cache: {ws['hits']} hit / {ws['misses']} miss / {ws['stale']} stale")
         else:
             st.caption(T['waiting_data'])
 
-# --- TAB 2: SPECIFICATIONS ---
-with tab2:
+
+@st.fragment
+def specs_section(T, lang, model, ac):
     c_img, c_info = st.columns([1, 2])
     with c_img:
         img_p = os.path.join("images", ac["img"])
@@ -345,117 +222,182 @@ with tab2:
         st.markdown(f"""
         <div class="spec-card">
         {desc_text}<br><br>
-        <b>{T['mass']}:</b> {ac['mass']} kg<br>
+        <b>{T['mass']}:</b> {ac['mass']:g} kg<br>
         <b>{T['len']}:</b> {ac['length']}<br>
         <b>{T['eng']}:</b> {ac['engine']}
         </div>
         """, unsafe_allow_html=True)
 
-# --- TAB 3: ANALYSIS ---
-with tab3:
-    col_g1, col_g2 = st.columns(2)
-    with col_g1:
-        st.subheader(T['env_title'])
-        # Flight Envelope Plot
-        alts = np.linspace(0, 16000, 100)
-        stalls = [np.sqrt((2 * ac["mass"] * 9.81) / (1.225 * np.exp(-a / 8500) * area_c * 1.6)) for a in alts]
-
-        fig, ax = plt.subplots(figsize=(6, 3))
-        fig.patch.set_facecolor('#1b1e24');
-        ax.set_facecolor('#0e1117')
-        ax.plot(alts, stalls, color='#00ffcc', linewidth=2)
-        ax.fill_between(alts, stalls, 1000, color='#00ffcc', alpha=0.1)
-
-        pt_c = '#00ff00' if velocity > stall_v else '#ff0000'
-        ax.scatter(target_alt, velocity, color=pt_c, s=150, zorder=5)
-
-        ax.set_xlabel(T['alt'], color='white');
-        ax.set_ylabel(T['spd'], color='white')
-        ax.tick_params(colors='white');
-        ax.grid(alpha=0.2)
-        st.pyplot(fig)
-
-    with col_g2:
-        st.subheader(T['wind_title'])
-        # Wind vs Ground Speed Plot
-        winds = np.linspace(-30, 30, 100)
-        req_speed = (stall_v * 1.1) + winds
-
-        fig2, ax2 = plt.subplots(figsize=(6, 3))
-        fig2.patch.set_facecolor('#1b1e24');
-        ax2.set_facecolor('#0e1117')
-        ax2.plot(winds, req_speed, color='#ff00ff', linewidth=2)
-        ax2.axvline(0, color='white', linestyle='--')
-
-        ax2.set_xlabel("Wind (m/s)", color='white');
-        ax2.set_ylabel("Ground Speed", color='white')
-        ax2.tick_params(colors='white');
-        ax2.grid(alpha=0.2)
-        st.pyplot(fig2)
-
-# --- TAB 4: SIMULATION (ADVANCED LOGIC) ---
-with tab4:
-    if len(st.session_state.route) == 2:
-        if st.button(T['start'], type="primary"):
-            st.info(T['sim_running'])
-            prog = st.progress(0)
-            status_text = st.empty()
-
-            c1, c2 = st.columns(2)
-            m1 = c1.empty();
-            m2 = c2.empty()
-
-            # --- CRASH LOGIC ---
-            crash_type = None
-
-            # 1. Ceiling Check
-            if target_alt > ac["ceiling"]:
-                crash_type = "ALT_HIGH"
-
-            # 2. Stall Check
-            elif velocity < stall_v:
-                crash_type = "STALL"
-
-            # 3. Structural Speed Limit (Vne) Check
-            elif velocity > ac["speed_limit"]:
-                crash_type = "STRUCT"
-
-            # 4. Low Altitude Overspeed (Dynamic Pressure) Check
-            # If below 1000m and speed is above the low_alt_limit
-            elif target_alt < 1000 and velocity > ac.get("low_alt_limit", 200):
-                crash_type = "ALT_LOW_SPEED"
-
-            # Simulation Loop
-            for i in range(101):
-                time.sleep(0.04)
-                prog.progress(i)
-
-                # Update Metrics
-                curr_alt = int(target_alt * (i / 100))
-                m1.metric(T['alt'], f"{curr_alt} m")
-                m2.metric("RPM", f"{int(90 + np.random.randn() * 2)} %")
-
-                # Trigger Crash at 60% if condition met
-                if crash_type and i == 60:
-                    time.sleep(1)  # Dramatic pause
-
-                    if crash_type == "ALT_HIGH":
-                        msg = T['crash_alt_high']
-                    elif crash_type == "STALL":
-                        msg = T['crash_stall']
-                    elif crash_type == "STRUCT":
-                        msg = T['crash_struct']
-                    elif crash_type == "ALT_LOW_SPEED":
-                        msg = T['crash_alt_low']
-
-                    status_text.markdown(f"<div class='crash-box'>{msg}<br>{T['sim_failed']}</div>",
-                                         unsafe_allow_html=True)
-                    st.error(msg)
-                    break
-
-            # Success (Only if no crash)
-            if not crash_type:
-                st.success(f"✅ {T['sim_done']}")
-                st.balloons()
+
+@st.fragment
+def analysis_section(T, ac, sim_tab):
+    """Owns the flight parameters, so moving them reruns only analysis and simulation."""
+    with diag.fragment("analysis") as d:
+        st.sidebar.subheader(T['params'])
+        target_alt = st.sidebar.slider(T['alt'], 0, 16000, 8000, key="target_alt")
+        velocity = st.sidebar.number_input(T['spd'], value=220, key="velocity")
+
+        # Flight Physics Calculations
+        stall_v = float(physics.stall_speed(target_alt, ac["mass"], ac["area"]))
+
+        col_g1, col_g2 = st.columns(2)
+        with col_g1:
+            st.subheader(T['env_title'])
+            # Flight Envelope Plot (cached background + operating point, see aeroguard.charts)
+            with d.span("charts"):
+                st.image(charts.envelope_image(ac["mass"], ac["area"], target_alt, velocity, stall_v,
+                                               T['alt'], T['spd']))
+
+        with col_g2:
+            st.subheader(T['wind_title'])
+            # Wind vs Ground Speed Plot
+            # Surface headwind at departure from the forecast field, when one is loaded
+            field, route = get_wind_field(), st.session_state.route
+            wind = None
+            if field is not None and len(route) >= 2:
+                wind = float(field.headwind(*route[0], 0.0, time.time(), departure_course(route)))
+            with d.span("charts"):
+                st.image(charts.takeoff_image(ac["mass"], ac["area"], stall_v, "Wind (m/s)", "Ground Speed",
+                                              wind=wind))
+
+        # Crash rule per altitude x speed cell (adaptive quadtree, cached per envelope)
+        st.subheader(T['safety_title'])
+        with d.span("safety_map"):
+            st.image(charts.safety_image(ac, target_alt, velocity, T['alt'], T['spd']))
+            smap = safety_map.safety_map(ac)
+        st.caption(f"{smap.codes.shape[1]} × {smap.codes.shape[0]} cells, "
+                   f"{smap.evaluations:,} envelope checks ({smap.evaluations / smap.cells:.1%})")
+
+    with sim_tab:
+        simulation_section(T, ac, st.session_state.route, target_alt, velocity)
+
+
+def show_frame(T, metrics, frame):
+    """Writes one telemetry sample to the four metric placeholders."""
+    m1, m2, m3, m4 = metrics
+    m1.metric(T['alt'], f"{int(frame['alt'])} m")
+    m2.metric(T['spd'], f"{int(frame['speed'])}")
+    m3.metric(T['dist'], f"{frame['dist'] / 1000:.1f}")
+    m4.metric(T['fuel'], f"{int(frame['fuel'])}")
+
+
+@st.fragment
+def simulation_section(T, ac, route, target_alt, velocity):
+    if len(route) < 2:
+        st.markdown(f"<div class='warning-box'>{T['no_route']}</div>", unsafe_allow_html=True)
+        return
+
+    # The last run is kept per session and shown while its inputs are unchanged
+    run_key = hash((route.tobytes(), repr(ac), target_alt, velocity))
+    started = st.button(T['start'], type="primary")
+    run = st.session_state.get('sim_run')
+    if not started and not (run and run['key'] == run_key):
+        return
+
+    if started:
+        st.info(T['sim_running'])
+        prog = st.progress(0)
+    status_text = st.empty()
+    metrics = [c.empty() for c in st.columns(4)]
+
+    if started:
+        with diag.fragment("simulation") as d:
+            # --- FLIGHT INTEGRATION & CRASH LOGIC ---
+            # Climb/cruise/descent with Ceiling, Stall, Vne and Low Altitude
+            # Overspeed checks at every step (see aeroguard.simulation)
+            with d.span("simulation"):
+                # Winds aloft along the whole trajectory from the forecast field, else
+                # the surface wind at departure, resolved against each leg's course
+                field, result = get_wind_field(), None
+                if field is not None:
+                    try:
+                        result = simulate(route, ac, target_alt, velocity, wind=field.wind_from(time.time()))
+                    except ValueError as e:
+                        st.error(str(e))
+                if result is None:
+                    w0 = get_real_weather(*route[0])
+                    uv = windfield.wind_components(w0['windspeed'] / 3.6, w0['winddirection']) if w0 else None
+                    result = simulate(route, ac, target_alt, velocity,
+                                      wind=(lambda lat, lon, alt, t: uv) if uv else None)
+                tele = TelemetryBuffer.from_result(result, ac)
+            run = st.session_state.sim_run = {"key": run_key, "telemetry": tele,
+                                              "crash_type": result.crash_type}
+
+            # Paced replay from the telemetry buffer at a throttled frame rate
+            last = len(tele) - 1
+            with d.span("sim_playback"):
+                for i in playback(tele, duration=SIM_PLAYBACK_SECONDS, fps=SIM_FPS):
+                    prog.progress(int(100 * i / last) if last else 100)
+                    show_frame(T, metrics, tele.frame(i))
+
+    # Scrub through the recorded flight
+    tele = run['telemetry']
+    if len(tele) > 1:
+        i = st.slider(T['replay'], 0, len(tele) - 1, len(tele) - 1, key=f"sim_scrub_{run_key}")
     else:
-        st.markdown(f"<div class='warning-box'>{T['no_route']}</div>", unsafe_allow_html=True)
\ No newline at end of file
+        i = 0
+    show_frame(T, metrics, tele.frame(i))
+
+    crash_type = run['crash_type']
+    if crash_type:
+        if crash_type == "ALT_HIGH":
+            msg = T['crash_alt_high']
+        elif crash_type == "STALL":
+            msg = T['crash_stall']
+        elif crash_type == "STRUCT":
+            msg = T['crash_struct']
+        elif crash_type == "ALT_LOW_SPEED":
+            msg = T['crash_alt_low']
+
+        status_text.markdown(f"<div class='crash-box'>{msg}<br>{T['sim_failed']}</div>",
+                             unsafe_allow_html=True)
+        st.error(msg)
+
+    # Success (Only if no crash)
+    if not crash_type:
+        st.success(f"✅ {T['sim_done']}")
+        if started:
+            st.balloons()
+
+    # Recorded profile and envelope margins
+    t = tele.t
+    col_c1, col_c2 = st.columns(2)
+    col_c1.line_chart({"t (s)": t, T['alt']: tele.column("alt")}, x="t (s)")
+    col_c2.line_chart({"t (s)": t, "Stall margin": tele.column("stall_margin"),
+                       "Vne margin": tele.column("vne_margin")}, x="t (s)")
+
+    # Export (files are generated on click)
+    col_e1, col_e2 = st.columns(2)
+    col_e1.download_button(f"⬇️ {T['export']} (CSV)", tele.to_csv, file_name="telemetry.csv",
+                           mime="text/csv", on_click="ignore")
+    if importlib.util.find_spec("pyarrow"):
+        col_e2.download_button(f"⬇️ {T['export']} (Parquet)", tele.to_parquet, file_name="telemetry.parquet",
+                               mime="application/octet-stream", on_click="ignore")
+
+
+# --- TAB 1: ROUTE PLANNING ---
+with tab1:
+    col_map, col_weather = st.columns([3, 1])
+    with col_map:
+        route_section(T, ac["icon"])
+    with col_weather:
+        weather_section(T, st.session_state.route)
+
+# --- TAB 2: SPECIFICATIONS ---
+with tab2:
+    specs_section(T, lang, model, ac)
+
+# --- TAB 3 & 4: ANALYSIS AND SIMULATION (ADVANCED LOGIC) ---
+with tab3:
+    analysis_section(T, ac, tab4)
+
+# --- DIAGNOSTICS PANEL ---
+st.sidebar.checkbox("🔧 Diagnostics", key="diagnostics")
+if diag.enabled:
+    record = diag.emit()
+    if st.session_state.get('diagnostics'):
+        with st.sidebar.expander("⏱️ Rerun Timing", expanded=True):
+            st.metric("Total", f"{record['total_ms']:.0f} ms")
+            st.dataframe([{"Span": k, "ms": v} for k, v in record['spans_ms'].items()], hide_index=True)
+            if record['counters']:
+                st.json(record['counters'])
@@ -0,0 +1,38 @@
+"""Aircraft table: CSV loading and the all-types envelope evaluation."""
+
+import numpy as np
+import pytest
+
+from aeroguard import physics
+from aeroguard.aircraft import AIRCRAFT_DB, DEFAULT_PATH, load_aircraft
+
+
+def test_check_all_matches_per_type_checks():
+    rng = np.random.default_rng(20260401)
+    alt = rng.uniform(0.0, 16000.0, 1000)
+    vel = rng.uniform(0.0, 700.0, 1000)
+
+    stall_v, codes = AIRCRAFT_DB.check_all(alt, vel)
+    assert codes.shape == (len(AIRCRAFT_DB), 1000)
+    for i, name in enumerate(AIRCRAFT_DB):
+        ref_stall, ref_codes = physics.check_envelope(alt, vel, AIRCRAFT_DB[name])
+        np.testing.assert_allclose(stall_v[i], ref_stall)
+        np.testing.assert_array_equal(codes[i], ref_codes)
+
+
+def test_check_all_subset_keeps_name_order():
+    names = ["Cessna 172 Skyhawk", "Boeing 737-800"]
+    _, codes = AIRCRAFT_DB.check_all([500.0, 11000.0], [60.0, 230.0], names=names)
+    for row, name in zip(codes, names):
+        np.testing.assert_array_equal(row, physics.crash_codes([500.0, 11000.0], [60.0, 230.0], AIRCRAFT_DB[name]))
+
+
+def test_short_row_is_rejected_with_its_line(tmp_path):
+    with open(DEFAULT_PATH, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    lines[2] = lines[2].rsplit(",", 1)[0]  # drop the trailing field of the second aircraft
+    path = tmp_path / "aircraft.csv"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="line 3"):
+        load_aircraft(str(path))
@@ -0,0 +1,75 @@
+"""Vectorized geodesy kernels checked against geopy on random samples."""
+
+import numpy as np
+import pytest
+from geographiclib.geodesic import Geodesic
+from geopy.distance import geodesic, great_circle
+
+from aeroguard import geo
+
+ELLIPSOIDAL_TOL_M = 1e-3  # Stated agreement with geopy.distance.geodesic
+SPHERICAL_REL_TOL = 6e-3  # Sphere vs WGS-84 differs by up to ~0.5 %
+
+
+@pytest.fixture(scope="module")
+def samples():
+    rng = np.random.default_rng(20260101)
+    n = 500
+    lat1, lat2 = rng.uniform(-89.9, 89.9, (2, n))
+    lon1, lon2 = rng.uniform(-180, 180, (2, n))
+    # Include short hops and nearly antipodal pairs, where Vincenty struggles.
+    lat2[:25] = lat1[:25] + rng.normal(0, 0.01, 25)
+    lon2[:25] = lon1[:25] + rng.normal(0, 0.01, 25)
+    lat2[25:40] = -lat1[25:40] + rng.normal(0, 1e-3, 15)
+    lon2[25:40] = lon1[25:40] + 180 + rng.normal(0, 1e-3, 15)
+    return lat1, lon1, lat2, lon2
+
+
+def _pairs(samples):
+    return list(zip(*samples))
+
+
+def test_ellipsoidal_distance_matches_geopy(samples):
+    d = geo.distance(*samples, ellipsoidal=True)
+    ref = np.array([geodesic((a, b), (c, e)).meters for a, b, c, e in _pairs(samples)])
+    assert np.max(np.abs(d - ref)) < ELLIPSOIDAL_TOL_M
+
+
+def test_small_batches_match_geopy(samples):
+    for a, b, c, e in _pairs(samples)[:50]:
+        assert abs(float(geo.distance(a, b, c, e, ellipsoidal=True)) - geodesic((a, b), (c, e)).meters) < ELLIPSOIDAL_TOL_M
+
+
+def test_spherical_distance(samples):
+    d = geo.distance(*samples)
+    ref = np.array([geodesic((a, b), (c, e)).meters for a, b, c, e in _pairs(samples)])
+    assert np.all(np.abs(d - ref) <= SPHERICAL_REL_TOL * ref + 1.0)
+    gc = np.array([great_circle((a, b), (c, e)).meters for a, b, c, e in _pairs(samples)])
+    assert np.allclose(d, gc, rtol=1e-6)  # Only the Earth radius differs
+
+
+def test_bearings_match_geographiclib(samples):
+    lat1, lon1, lat2, lon2 = (s[40:] for s in samples)
+    az1 = geo.initial_bearing(lat1, lon1, lat2, lon2, ellipsoidal=True)
+    az2 = geo.final_bearing(lat1, lon1, lat2, lon2, ellipsoidal=True)
+    ref = np.array([Geodesic.WGS84.Inverse(*p) for p in zip(lat1, lon1, lat2, lon2)])
+    ref1 = np.array([r["azi1"] for r in ref]) % 360
+    ref2 = np.array([r["azi2"] for r in ref]) % 360
+    assert np.max(np.abs((az1 - ref1 + 180) % 360 - 180)) < 1e-6
+    assert np.max(np.abs((az2 - ref2 + 180) % 360 - 180)) < 1e-6
+
+
+def test_intermediate_point_splits_distance(samples):
+    lat1, lon1, lat2, lon2 = (s[40:] for s in samples)
+    for ellipsoidal in (False, True):
+        total = geo.distance(lat1, lon1, lat2, lon2, ellipsoidal=ellipsoidal)
+        mlat, mlon = geo.intermediate(lat1, lon1, lat2, lon2, 0.25, ellipsoidal=ellipsoidal)
+        first = geo.distance(lat1, lon1, mlat, mlon, ellipsoidal=ellipsoidal)
+        assert np.max(np.abs(first - 0.25 * total)) < 0.01
+
+
+def test_cross_track_distance():
+    # Equator eastbound: points north are left (negative), south are right.
+    d = geo.cross_track_distance([1.0, -1.0, 0.0], [5.0, 5.0, 5.0], 0.0, 0.0, 0.0, 10.0)
+    one_degree = np.radians(1.0) * geo.EARTH_RADIUS_M
+    assert np.allclose(d, [-one_degree, one_degree, 0.0], atol=1e-6)
@@ -0,0 +1,21 @@
+"""Adaptive safety map against the brute-force reference."""
+
+import numpy as np
+import pytest
+
+from aeroguard import safety_map
+from aeroguard.aircraft import AIRCRAFT_DB
+
+
+@pytest.mark.parametrize("name", list(AIRCRAFT_DB))
+def test_adaptive_map_equals_full_map(name):
+    ac = AIRCRAFT_DB[name]
+    smap = safety_map.safety_map(ac)
+    np.testing.assert_array_equal(smap.codes, safety_map.full_map(ac))
+    assert smap.evaluations < smap.cells
+    assert not smap.codes.flags.writeable
+
+
+def test_custom_overrides_get_their_own_map():
+    ac = AIRCRAFT_DB["Cessna 172 Skyhawk"].with_overrides(ceiling=9000.0, mass=1500.0)
+    np.testing.assert_array_equal(safety_map.safety_map(ac).codes, safety_map.full_map(ac))
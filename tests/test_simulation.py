@@ -0,0 +1,52 @@
+"""Flight integrator: the vectorized constant-wind path against the reference step loop."""
+
+import numpy as np
+import pytest
+
+from aeroguard import geo, physics, simulation
+from aeroguard.aircraft import AIRCRAFT_DB
+
+
+def _random_cases(n, seed=20260301):
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        start = rng.uniform((35.0, 25.0), (42.0, 45.0))
+        track = geo.as_track([start, start + rng.uniform(-3.0, 3.0, 2)])
+        yield (track, rng.uniform(500.0, 12000.0), rng.uniform(60.0, 300.0), rng.uniform(0.5, 5.0),
+               rng.uniform(3.0, 25.0), rng.uniform(3.0, 20.0), rng.uniform(-40.0, 40.0), rng.uniform(60.0, 250.0))
+
+
+@pytest.mark.parametrize("case", list(_random_cases(60)))
+def test_constant_wind_path_matches_step_loop(case):
+    track, cruise_alt, cruise_speed, dt, climb, descent, wind, low_alt_limit = case
+    cum_dist = geo.cumulative_distance(track)
+    if min(cruise_speed, low_alt_limit) - wind <= 0:
+        pytest.skip("no progress possible; simulate() uses the step loop")
+
+    fast = simulation._integrate_profile(float(cum_dist[-1]), cruise_alt, cruise_speed, low_alt_limit,
+                                         dt, climb, descent, wind)
+    ref = simulation._integrate_stepwise(track, cum_dist, cruise_alt, cruise_speed, low_alt_limit,
+                                         dt, climb, descent, wind)
+    assert len(fast[0]) == len(ref[0])
+    for a, b in zip(fast, ref):
+        np.testing.assert_allclose(a, b, rtol=1e-9, atol=1e-6)
+
+
+def test_crash_stops_at_first_violating_step():
+    ac = AIRCRAFT_DB["Cessna 172 Skyhawk"]
+    route = [(41.0, 29.0), (39.9, 32.8)]
+    result = simulation.simulate(route, ac, cruise_alt=ac["ceiling"] + 2000, cruise_speed=50)
+
+    _, codes = physics.check_envelope(result.alt, result.speed, ac)
+    assert result.crash_type == "ALT_HIGH"
+    assert result.crash_step == len(result) - 1
+    assert codes[-1] == result.crash_code
+    assert not codes[:-1].any()
+    assert not result.completed
+
+
+def test_completed_flight_reaches_the_end():
+    result = simulation.simulate([(41.0, 29.0), (39.9, 32.8)], AIRCRAFT_DB["Boeing 737-800"], 9000, 230)
+    assert result.completed and result.crash_step == -1
+    assert result.dist[-1] == pytest.approx(result.route_length)
+    assert result.alt[-1] == 0.0
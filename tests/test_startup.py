@@ -0,0 +1,47 @@
+"""Cold-import budget: the computational core loads without UI or network libraries."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORE_MODULES = ("aeroguard.physics", "aeroguard.aircraft", "aeroguard.geo", "aeroguard.simulation",
+                "aeroguard.sweep", "aeroguard.tracks", "aeroguard.weather", "aeroguard.charts",
+                "aeroguard.mapview", "aeroguard.diagnostics", "aeroguard.i18n", "aeroguard.windfield")
+HEAVY_MODULES = ("streamlit", "streamlit_folium", "folium", "matplotlib", "PIL", "requests", "geopy")
+IMPORT_BUDGET_S = 0.35  # measured ~0.1-0.16 s, about numpy plus a little; best of IMPORT_RUNS
+IMPORT_RUNS = 3
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+elapsed = time.perf_counter() - t0
+print(json.dumps({"elapsed": elapsed, "modules": sorted(m.split(".")[0] for m in sys.modules)}))
+"""
+
+
+def _cold_import(modules):
+    out = subprocess.run([sys.executable, "-c", PROBE, *modules], cwd=REPO_ROOT,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+@pytest.fixture(scope="module")
+def core_import():
+    return _cold_import(CORE_MODULES)
+
+
+def test_core_import_loads_no_heavy_libraries(core_import):
+    loaded = set(core_import["modules"]) & set(HEAVY_MODULES)
+    assert not loaded, f"importing the core pulled in {sorted(loaded)}"
+
+
+def test_core_import_within_budget(core_import):
+    # Best of a few cold runs, so one slow process start on a busy machine does not fail it
+    runs = [core_import["elapsed"]] + [_cold_import(CORE_MODULES)["elapsed"] for _ in range(IMPORT_RUNS - 1)]
+    assert min(runs) < IMPORT_BUDGET_S, f"core import took {min(runs):.3f} s (budget {IMPORT_BUDGET_S} s)"
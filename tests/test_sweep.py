@@ -0,0 +1,80 @@
+"""Batch mission sweep: matrix input formats and an end-to-end run."""
+
+import csv
+import json
+
+import pytest
+
+from aeroguard import sweep
+
+ROUTE = [41.0, 29.0, 40.5, 29.8]
+GRID = {"aircraft": ["Cessna 172 Skyhawk", "Boeing 737-800"], "routes": [ROUTE],
+        "cruise_alt": [2000, 8000], "speed": [60, 220]}
+
+
+def _mission(aircraft, alt, speed, **extra):
+    return {"aircraft": aircraft, "start_lat": ROUTE[0], "start_lon": ROUTE[1],
+            "end_lat": ROUTE[2], "end_lon": ROUTE[3], "cruise_alt": alt, "speed": speed, **extra}
+
+
+def test_read_missions_formats(tmp_path):
+    grid = tmp_path / "grid.json"
+    grid.write_text(json.dumps(GRID), encoding="utf-8")
+    missions, total = sweep.read_missions(str(grid))
+    missions = list(missions)
+    assert total == sweep.grid_size(GRID) == len(missions) == 8
+    assert missions[0] == {**_mission("Cessna 172 Skyhawk", 2000, 60), "headwind": 0.0}
+
+    listed = tmp_path / "list.json"
+    listed.write_text(json.dumps([_mission("Boeing 737-800", 8000, 220)]), encoding="utf-8")
+    missions, total = sweep.read_missions(str(listed))
+    assert total == 1 and list(missions)[0]["aircraft"] == "Boeing 737-800"
+
+    table = tmp_path / "missions.csv"
+    with open(table, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=list(_mission("x", 0, 0)) + ["ceiling"])
+        w.writeheader()
+        w.writerow(_mission("Cessna 172 Skyhawk", 8000, 60, ceiling=""))
+    missions, total = sweep.read_missions(str(table))
+    rows = list(missions)
+    assert total is None and rows[0]["cruise_alt"] == "8000"
+
+
+def test_envelope_overrides_apply_per_row():
+    stock = sweep.run_mission(0, _mission("Cessna 172 Skyhawk", 8000, 60))
+    raised = sweep.run_mission(1, _mission("Cessna 172 Skyhawk", 8000, 60, ceiling="12000"))
+    assert stock[2] == "ALT_HIGH"
+    assert raised[2] != "ALT_HIGH"
+    assert sweep._profile(_mission("Cessna 172 Skyhawk", 0, 0, mass="")).overrides == {}
+
+
+def test_bad_rows_become_error_rows():
+    rows = sweep._run_chunk([(0, _mission("No Such Plane", 3000, 100)),
+                             (1, _mission("Boeing 737-800", "high", 220))])
+    assert [r[0] for r in rows] == [0, 1]
+    assert all(r[2].startswith("ERROR") for r in rows)
+    assert all(v is None for r in rows for v in r[3:])
+
+
+def test_run_sweep_writes_csv(tmp_path):
+    out = tmp_path / "results.csv"
+    missions = [*sweep._grid_missions(GRID), _mission("No Such Plane", 3000, 100)]
+    stats = sweep.run_sweep(missions, str(out), workers=1, chunk_size=3, progress=False)
+
+    with open(out, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert tuple(rows[0]) == sweep.RESULT_FIELDS
+    assert len(rows) - 1 == stats["missions"] == 9
+    assert [int(r[0]) for r in rows[1:]] == list(range(9))
+    assert stats["errors"] == 1
+    # Mission 2 is the Cessna at 8000 m / 60 m/s, above its ceiling.
+    assert rows[3][1:3] == ["Cessna 172 Skyhawk", "ALT_HIGH"]
+
+
+def test_run_sweep_writes_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    out = tmp_path / "results.parquet"
+    sweep.run_sweep(sweep._grid_missions(GRID), str(out), workers=1, progress=False)
+    table = pq.read_table(out)
+    assert tuple(table.column_names) == sweep.RESULT_FIELDS
+    assert table.num_rows == 8
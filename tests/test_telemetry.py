@@ -0,0 +1,93 @@
+"""Telemetry ring buffer against a plain-list reference, thinning and export round-trips."""
+
+import io
+
+import numpy as np
+import pytest
+
+from aeroguard import simulation
+from aeroguard.aircraft import AIRCRAFT_DB
+from aeroguard.telemetry import DTYPE, TelemetryBuffer
+
+ROUTE = [(41.0, 29.0), (39.9, 32.8)]
+
+
+def test_wrap_around_keeps_newest_in_order():
+    buf = TelemetryBuffer(capacity=4)
+    buf.extend(t=np.arange(3.0))
+    buf.extend(t=np.arange(3.0, 6.0))
+    np.testing.assert_array_equal(buf.t, [2.0, 3.0, 4.0, 5.0])
+    np.testing.assert_array_equal(buf.column("step"), [2, 3, 4, 5])
+    assert buf.dropped == 2
+    assert buf.frame(0)["t"] == 2.0 and buf.latest()["t"] == 5.0
+    with pytest.raises(IndexError):
+        buf.frame(4)
+
+
+def test_stride_phase_carries_across_extends():
+    buf = TelemetryBuffer(capacity=100, stride=3)
+    for n in (2, 1, 4, 5, 3):
+        buf.extend(t=np.zeros(n))
+    np.testing.assert_array_equal(buf.column("step"), [0, 3, 6, 9, 12])
+    assert buf.steps_seen == 15 and buf.dropped == 0
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_list_reference(seed):
+    rng = np.random.default_rng(seed)
+    capacity, stride = int(rng.integers(1, 40)), int(rng.integers(1, 5))
+    buf = TelemetryBuffer(capacity=capacity, stride=stride)
+    recorded = []
+    step = 0
+    for _ in range(int(rng.integers(1, 30))):
+        n = int(rng.integers(0, 3 * capacity))
+        alt = rng.uniform(0.0, 1e4, n)
+        buf.extend(alt=alt)
+        recorded += [(step + i, a) for i, a in enumerate(alt) if (step + i) % stride == 0]
+        step += n
+
+    kept = recorded[-capacity:]
+    assert len(buf) == len(kept)
+    assert buf.dropped == len(recorded) - len(kept)
+    assert buf.steps_seen == step
+    np.testing.assert_array_equal(buf.column("step"), [s for s, _ in kept])
+    np.testing.assert_array_equal(buf.column("alt"), [a for _, a in kept])
+
+
+@pytest.mark.parametrize("capacity", [2, 7, 100, 5000])
+def test_from_result_thins_and_keeps_last_step(capacity):
+    result = simulation.simulate(ROUTE, AIRCRAFT_DB["Boeing 737-800"], 9000, 230)
+    buf = TelemetryBuffer.from_result(result, AIRCRAFT_DB["Boeing 737-800"], capacity=capacity)
+    steps = buf.column("step")
+    assert len(buf) <= capacity and buf.dropped == 0
+    assert steps[0] == 0 and steps[-1] == len(result) - 1
+    assert np.all(np.diff(steps[:-1]) == buf.stride)
+    assert buf.latest()["dist"] == result.dist[-1]
+
+
+def test_csv_round_trip():
+    buf = _sample_buffer()
+    text = buf.to_csv()
+    back = np.genfromtxt(io.StringIO(text), delimiter=",", names=True, dtype=None, encoding="utf-8")
+    assert back.dtype.names == DTYPE.names
+    for name in DTYPE.names:
+        np.testing.assert_allclose(back[name], buf.column(name), equal_nan=True)
+
+
+def test_parquet_round_trip(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    buf = _sample_buffer()
+    table = pq.read_table(io.BytesIO(buf.to_parquet()))
+    assert tuple(table.column_names) == DTYPE.names
+    for name in DTYPE.names:
+        np.testing.assert_array_equal(table.column(name).to_numpy(), buf.column(name))
+
+    buf.to_parquet(str(tmp_path / "flight.parquet"))
+    assert pq.read_table(tmp_path / "flight.parquet").num_rows == len(buf)
+
+
+def _sample_buffer():
+    """Crashing flight, so the low-altitude margin holds both NaN and values."""
+    ac = AIRCRAFT_DB["Cessna 172 Skyhawk"]
+    result = simulation.simulate(ROUTE, ac, ac["ceiling"] + 2000, 50)
+    return TelemetryBuffer.from_result(result, ac, capacity=50)
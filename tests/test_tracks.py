@@ -0,0 +1,107 @@
+"""Track import (GPX / CSV streaming) and Douglas-Peucker simplification."""
+
+import io
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from aeroguard import tracks
+
+GPX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.1" creator="test" xmlns="http://www.topografix.com/GPX/1/1">
+  <metadata><name>sample</name></metadata>
+  <rte><rtept lat="41.0" lon="29.0"><name>IST</name></rtept></rte>
+  <trk><name>flight</name>
+    <trkseg>
+      <trkpt lat="41.1" lon="29.1"><ele>120</ele><time>2026-01-01T00:00:00Z</time></trkpt>
+      <trkpt lat="41.2" lon="29.3"><ele>450</ele></trkpt>
+    </trkseg>
+    <trkseg><trkpt lat="41.3" lon="29.6"/></trkseg>
+  </trk>
+</gpx>
+"""
+
+
+def test_gpx_reads_namespaced_route_and_track_points():
+    track = tracks.load_track(io.BytesIO(GPX), name="flight.gpx")
+    np.testing.assert_array_equal(track, [[41.0, 29.0], [41.1, 29.1], [41.2, 29.3], [41.3, 29.6]])
+
+
+def test_gpx_elements_are_detached_while_parsing(monkeypatch):
+    roots = []
+    iterparse = ET.iterparse
+
+    def spy(source, events):
+        for event, elem in iterparse(source, events=events):
+            if not roots:
+                roots.append(elem)
+            yield event, elem
+    monkeypatch.setattr(tracks.ET, "iterparse", spy)
+
+    assert len(tracks.read_gpx(io.BytesIO(GPX))) == 4
+    assert len(roots[0]) == 0  # nothing left hanging off the root
+
+
+def test_csv_header_aliases_and_skipped_rows():
+    text = "Time,LATITUDE,Lng,alt\n0,41.0,29.0,0\n1,,29.1,10\n\n2,41.2,29.2,20\nbad,row\n3,41.3,29.3,30\n"
+    track = tracks.load_track(io.BytesIO(text.encode("utf-8")), name="adsb.csv")
+    np.testing.assert_array_equal(track, [[41.0, 29.0], [41.2, 29.2], [41.3, 29.3]])
+
+
+def test_csv_without_coordinates_is_rejected():
+    with pytest.raises(ValueError, match="latitude and longitude"):
+        tracks.read_csv(io.StringIO("x,y\n1,2\n"))
+
+
+@pytest.mark.parametrize("data, name", [
+    (b"lat,lon\n41.0,29.0\n", "one.csv"),
+    (b'<gpx xmlns="http://www.topografix.com/GPX/1/1"><trk><trkseg/></trk></gpx>', "empty.gpx"),
+])
+def test_fewer_than_two_points_is_an_error(data, name):
+    with pytest.raises(ValueError, match="at least two points"):
+        tracks.load_track(io.BytesIO(data), name=name)
+
+
+@pytest.fixture(scope="module")
+def wiggly_track():
+    rng = np.random.default_rng(20260601)
+    s = np.linspace(0.0, 1.0, 5000)
+    lat = 40.0 + 2.0 * s + 0.05 * np.sin(40 * s) + rng.normal(0.0, 1e-4, s.size)
+    lon = 28.0 + 5.0 * s + 0.05 * np.cos(25 * s)
+    return np.column_stack([lat, lon])
+
+
+def _projected(track):
+    return track[:, 1] * np.cos(np.radians(track[:, 0])), track[:, 0]
+
+
+def _max_deviation(track, keep):
+    """Largest distance of a dropped point from its simplified segment, in the DP projection."""
+    x, y = _projected(track)
+    worst = 0.0
+    for i, j in zip(keep[:-1], keep[1:]):
+        dx, dy = x[j] - x[i], y[j] - y[i]
+        px, py = x[i + 1:j] - x[i], y[i + 1:j] - y[i]
+        if not px.size:
+            continue
+        t = np.clip((px * dx + py * dy) / (dx * dx + dy * dy), 0.0, 1.0)
+        worst = max(worst, float(np.sqrt((px - t * dx) ** 2 + (py - t * dy) ** 2).max()))
+    return worst
+
+
+def test_douglas_peucker_keeps_endpoints_and_tolerance(wiggly_track):
+    tol = 0.002
+    keep = tracks.douglas_peucker(wiggly_track, tol)
+    assert keep[0] == 0 and keep[-1] == len(wiggly_track) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert 2 < len(keep) < len(wiggly_track) // 10
+    assert _max_deviation(wiggly_track, keep) <= tol
+
+
+def test_douglas_peucker_respects_point_budget(wiggly_track):
+    keep = tracks.douglas_peucker(wiggly_track, 1e-6, max_points=50)
+    assert len(keep) == 50
+    assert keep[0] == 0 and keep[-1] == len(wiggly_track) - 1
+    # The budget keeps the most significant points: coarser than the full run, but far better than a chord.
+    assert _max_deviation(wiggly_track, keep) < _max_deviation(wiggly_track, np.array([0, len(wiggly_track) - 1]))
@@ -0,0 +1,68 @@
+"""Envelope violation scan: chunked streaming against a single pass and the raw rule masks."""
+
+import numpy as np
+import pytest
+
+from aeroguard import physics, violations
+from aeroguard.aircraft import AIRCRAFT_DB
+
+AC = AIRCRAFT_DB["Cessna 172 Skyhawk"]
+
+
+def _flight(n, seed):
+    """Random walk in altitude / speed that keeps crossing the envelope rules."""
+    rng = np.random.default_rng(seed)
+    alt = np.clip(np.cumsum(rng.normal(0.0, 150.0, n)) + 2000.0, 0.0, None)
+    speed = np.clip(np.cumsum(rng.normal(0.0, 6.0, n)) + 60.0, 0.0, None)
+    return alt, speed
+
+
+def _feed_in_chunks(alt, speed, t, bounds):
+    scanner = violations.EnvelopeScanner(AC)
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        scanner.feed(alt[a:b], speed[a:b], t[a:b])
+    return scanner
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_any_chunking_matches_single_pass(seed):
+    alt, speed = _flight(2000, seed)
+    t = np.arange(len(alt)) * 0.5
+    expected = violations.scan(alt, speed, AC, t=t)
+    assert any(r.violated for r in expected.values())
+
+    rng = np.random.default_rng(seed + 1000)
+    cuts = np.sort(rng.choice(np.arange(1, len(alt)), size=rng.integers(1, 60), replace=False))
+    scanner = _feed_in_chunks(alt, speed, t, [0, *cuts.tolist(), len(alt)])
+    assert scanner.report() == expected
+
+    # Single-sample chunks are the worst case for the carry-over logic.
+    assert _feed_in_chunks(alt[:300], speed[:300], t[:300], list(range(301))).report() == \
+        violations.scan(alt[:300], speed[:300], AC, t=t[:300])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_intervals_cover_exactly_the_violating_samples(seed):
+    alt, speed = _flight(3000, seed)
+    t = np.arange(len(alt), dtype=float)
+    report = violations.scan(alt, speed, AC, t=t)
+
+    for rule, mask in zip(violations.RULES, physics.rule_violations(alt, speed, AC)):
+        rep = report[rule]
+        covered = np.zeros(len(alt), dtype=bool)
+        for (start, stop), (t0, t1) in zip(rep.intervals, rep.interval_times):
+            assert start < stop
+            assert not covered[start:stop].any()  # disjoint
+            covered[start:stop] = True
+            assert (t0, t1) == (t[start], t[stop - 1])
+        np.testing.assert_array_equal(covered, mask)
+        assert rep.samples == int(mask.sum())
+        first = int(np.argmax(mask)) if mask.any() else -1
+        assert rep.first_index == first
+
+
+def test_first_violation_is_earliest_across_rules():
+    alt = np.array([500.0, 500.0, 20000.0, 500.0])
+    speed = np.array([50.0, 10.0, 50.0, 50.0])
+    scanner = violations.EnvelopeScanner(AC, dt=2.0).feed(alt, speed)
+    assert scanner.first_violation() == ("STALL", 1, 2.0)
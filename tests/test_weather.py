@@ -0,0 +1,136 @@
+"""Weather client against the local stub: request coalescing and failure handling."""
+
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from aeroguard import weather_stub
+from aeroguard.diagnostics import Diagnostics
+from aeroguard.weather import WeatherCache, WeatherClient
+
+
+@pytest.fixture
+def stub():
+    server, url = weather_stub.start(latency=0.2)
+    yield server, url
+    server.shutdown()
+
+
+def test_concurrent_lookups_share_one_request(stub):
+    server, url = stub
+    client = WeatherClient(base_url=url, db_path=None)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.get(40.0, 30.0))) for _ in range(4)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join(timeout=10)
+
+    assert len(results) == 4
+    assert all(r == weather_stub.fake_current_weather(40.0, 30.0) for r in results)
+    assert server.RequestHandlerClass.calls == 1
+    assert client.stats["network_calls"] == 1
+    assert client.stats["coalesced"] == 3
+    client.close()
+
+
+def test_diagnostics_count_each_sessions_own_calls(stub):
+    _, url = stub
+    client = WeatherClient(base_url=url, db_path=None, batch_size=2)
+    route = [(40.0 + i, 30.0) for i in range(5)]
+    a, b = Diagnostics(enabled=True), Diagnostics(enabled=True)
+
+    def lookup(diag, points):
+        with diag.active():
+            client.get_many(points)
+    threads = [threading.Thread(target=lookup, args=(a, route)),
+               threading.Thread(target=lookup, args=(b, [(30.0, 20.0)]))]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join(timeout=10)
+
+    assert a.counters == {"weather.misses": 5, "weather.network_calls": 3}
+    assert b.counters == {"weather.misses": 1, "weather.network_calls": 1}
+    lookup(b, route[:2])
+    assert b.counters["weather.hits"] == 2
+    assert client.stats["network_calls"] == 4
+    client.close()
+
+
+def test_locked_disk_cache_is_not_fatal(stub):
+    _, url = stub
+    client = WeatherClient(base_url=url, db_path=":memory:")
+    client.cache._db = _LockedDb()
+
+    expected = weather_stub.fake_current_weather(40.0, 30.0)
+    assert client.get(40.0, 30.0) == expected  # disk write fails, memory entry serves
+    assert not client._inflight
+    assert client.get(40.0, 30.0) == expected
+    assert client.stats["hits"] == 1
+    client.close()
+
+
+def test_unexpected_error_resolves_waiters(stub, monkeypatch):
+    _, url = stub
+    client = WeatherClient(base_url=url, db_path=None)
+    monkeypatch.setattr(client.cache, "put", _raise_once(client.cache.put, RuntimeError("boom")))
+
+    with pytest.raises(RuntimeError):
+        client.get(40.0, 30.0)
+    assert not client._inflight
+    result = []
+    th = threading.Thread(target=lambda: result.append(client.get(40.0, 30.0)), daemon=True)
+    th.start()
+    th.join(timeout=10)
+    assert result == [weather_stub.fake_current_weather(40.0, 30.0)]
+    client.close()
+
+
+def test_waiter_falls_back_to_stale_after_timeout(stub):
+    _, url = stub
+    client = WeatherClient(base_url=url, db_path=None, ttl=0.0, wait=0.05)
+    key = (40.0, 30.0)
+    client.cache.put(key, {"temperature": 1.0}, fetched=0.0)
+    client._inflight[key] = Future()  # owned by a caller that never finishes
+
+    assert client.get(40.0, 30.0) == {"temperature": 1.0}
+    assert client.stats["stale"] == 1
+    client.close()
+
+
+def test_memory_cache_is_bounded_lru(tmp_path):
+    cache = WeatherCache(db_path=str(tmp_path / "weather.sqlite"), max_entries=2)
+    cache.put((1.0, 1.0), {"n": 1})
+    cache.put((2.0, 2.0), {"n": 2})
+    cache.get((1.0, 1.0))  # now most recently used
+    cache.put((3.0, 3.0), {"n": 3})
+
+    assert list(cache._mem) == [(1.0, 1.0), (3.0, 3.0)]
+    # Evicted cells are still served from the disk store.
+    assert cache.get((2.0, 2.0))[0] == {"n": 2}
+    assert len(cache._mem) == 2
+
+
+class _LockedDb:
+    """Stand-in connection whose every statement fails as if another process holds the lock."""
+
+    def execute(self, *args):
+        raise sqlite3.OperationalError("database is locked")
+
+    def commit(self):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def _raise_once(put, exc):
+    """Wraps `put` so that its first call raises `exc`."""
+    calls = []
+
+    def wrapped(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise exc
+        return put(*args, **kwargs)
+    return wrapped
@@ -0,0 +1,112 @@
+"""Gridded wind field: ingestion checks, interpolation and use in the integrator."""
+
+import numpy as np
+import pytest
+
+from aeroguard import geo, simulation, weather_stub, windfield
+from aeroguard.aircraft import AIRCRAFT_DB
+
+LATS, LONS, LEVELS, HOURS = [40.0, 41.0], [29.0, 30.0, 31.0], [1000, 850, 500], 3
+ROUTE = [(40.2, 29.2), (40.8, 30.8)]
+
+
+def _records(lats=LATS, lons=LONS):
+    names = [f"{var}_{p}hPa" for p in LEVELS for var in ("temperature", "wind_speed", "wind_direction")]
+    return [{"latitude": a, "longitude": b, "hourly": weather_stub.fake_hourly(a, b, names, HOURS)}
+            for a in lats for b in lons]
+
+
+@pytest.fixture
+def field(tmp_path):
+    windfield.ingest(str(tmp_path / "wind"), LATS, LONS, LEVELS, records=_records())
+    return windfield.WindField.open(str(tmp_path / "wind"))
+
+
+def test_ingest_from_stub_matches_saved_records(tmp_path):
+    server, url = weather_stub.start()
+    try:
+        live = windfield.ingest(str(tmp_path / "live"), LATS, LONS, LEVELS, base_url=url, hours=HOURS)
+    finally:
+        server.shutdown()
+    saved = windfield.ingest(str(tmp_path / "saved"), LATS, LONS, LEVELS, records=_records())
+    for name in windfield.VARIABLES:
+        np.testing.assert_array_equal(live.arrays[name], saved.arrays[name])
+
+
+def test_sample_is_exact_on_nodes_and_linear_between(field):
+    t, k = field.times[1], 1
+    s = field.sample(field.lats[0], field.lons[1], field.heights[k], t)
+    assert s["u"] == pytest.approx(field.arrays["u"][1, k, 0, 1])
+
+    mid = field.sample(field.lats[0], (field.lons[1] + field.lons[2]) / 2, field.heights[k], t)
+    expected = (field.arrays["temperature"][1, k, 0, 1] + field.arrays["temperature"][1, k, 0, 2]) / 2
+    assert mid["temperature"] == pytest.approx(expected)
+
+
+def test_missing_locations_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Expected 6 forecast locations"):
+        windfield.ingest(str(tmp_path / "wind"), LATS, LONS, LEVELS, records=_records()[:4])
+    with pytest.raises(ValueError, match="Expected 6 forecast locations"):
+        windfield.ingest(str(tmp_path / "wind"), LATS, LONS, LEVELS, records=_records() + _records()[:1])
+
+
+def test_null_values_are_rejected(tmp_path):
+    records = _records()
+    records[3]["hourly"]["wind_speed_850hPa"][1] = None
+    with pytest.raises(ValueError, match="Missing forecast values"):
+        windfield.ingest(str(tmp_path / "wind"), LATS, LONS, LEVELS, records=records)
+
+
+def test_failed_ingest_keeps_the_existing_field(field, tmp_path):
+    before = {name: np.array(field.arrays[name]) for name in windfield.VARIABLES}
+    records = _records()
+    records[4]["hourly"]["temperature_500hPa"][0] = None
+    with pytest.raises(ValueError, match="Missing forecast values"):
+        windfield.ingest(field.path, LATS, LONS, LEVELS, records=records)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["wind"]
+    again = windfield.WindField.open(field.path)
+    for name in windfield.VARIABLES:
+        np.testing.assert_array_equal(again.arrays[name], before[name])
+
+
+def test_ingest_replaces_an_existing_field(field):
+    windfield.ingest(field.path, LATS, LONS, LEVELS[:2], records=_records())
+    assert windfield.WindField.open(field.path).shape == (HOURS, 2, len(LATS), len(LONS))
+
+
+def test_simulate_with_field(field):
+    result = simulation.simulate(ROUTE, AIRCRAFT_DB["Boeing 737-800"], 5000, 220,
+                                 wind=field.wind_from(field.times[0]))
+    assert result.completed
+    assert not np.allclose(result.ground_speed, result.speed)
+
+
+@pytest.mark.parametrize("route, cruise_alt, speed", [
+    (ROUTE, 5000, 220),
+    ([(40.9, 31.5), (40.1, 30.0), (40.6, 28.6)], 3000, 60),
+])
+def test_field_path_matches_step_loop(field, route, cruise_alt, speed):
+    track = geo.as_track(route)
+    cum_dist = geo.cumulative_distance(track)
+    args = (track, cum_dist, cruise_alt, speed, 120.0, 1.0, 10.0, 8.0)
+    wind = field.wind_from(field.times[0])
+    fast = simulation._integrate_wind_field(*args, wind)
+    ref = simulation._integrate_stepwise(*args, 0.0, wind_uv=wind)
+    assert len(fast[0]) == len(ref[0])
+    for a, b in zip(fast, ref):
+        np.testing.assert_allclose(a, b, rtol=0, atol=simulation.TRAJECTORY_TOL)
+
+
+def test_non_finite_wind_is_refused():
+    with pytest.raises(ValueError, match="Non-finite wind"):
+        simulation.simulate(ROUTE, AIRCRAFT_DB["Boeing 737-800"], 5000, 220,
+                            wind=lambda lat, lon, alt, t: (float("nan"), 0.0))
+
+
+def test_varying_wind_without_progress_stops(monkeypatch):
+    monkeypatch.setattr(simulation, "MAX_STALLED_STEPS", 50)
+    result = simulation.simulate(ROUTE, AIRCRAFT_DB["Boeing 737-800"], 5000, 220,
+                                 headwind=lambda lat, lon, alt, t: 500.0)
+    assert len(result) == 50
+    assert not result.completed